@@ -0,0 +1,175 @@
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+import json
+import os
+
+import numpy as np
+
+DIMENSIONS = ("openness", "respect", "accountability", "practice", "validation", "outcomes")
+
+PLAYER_ID_BYTES = 32
+FLAGS_DTYPE = "uint64"  # one bit per bonus rule
+
+def column_layout(
+    dimensions: int,
+    flags_dtype: str = FLAGS_DTYPE
+) -> Dict[str, Tuple[np.dtype, Tuple[int, ...]]]:
+    """Fixed-width dtype and per-row shape of every stored column"""
+    return {
+        "timestamp": (np.dtype(np.float64), ()),
+        "player": (np.dtype(f"S{PLAYER_ID_BYTES}"), ()),
+        "difficulty": (np.dtype(np.uint8), ()),
+        "achieved": (np.dtype(np.float64), (dimensions,)),
+        "target": (np.dtype(np.float64), (dimensions,)),
+        "score": (np.dtype(np.float64), (dimensions,)),
+        "bonus": (np.dtype(np.float64), ()),
+        "bonus_flags": (np.dtype(flags_dtype), ()),
+        "total": (np.dtype(np.float64), ())
+    }
+
+class ActionStore:
+    """Append-only columnar store of scored actions.
+
+    Rows go into fixed-size segments; each column of a segment is its own
+    preallocated memory-mapped file, so scans get zero-copy NumPy views.
+    Only rows covered by the last flush() are visible after a restart.
+    Register `on_score` as a ScoringSystem listener to feed it.
+    """
+
+    META_FILE = "meta.json"
+
+    def __init__(
+        self,
+        path: str,
+        segment_rows: int = 1 << 20,
+        dimensions: Tuple[str, ...] = DIMENSIONS
+    ):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        meta_path = self.path / self.META_FILE
+        if meta_path.exists():
+            meta = json.loads(meta_path.read_text())
+            self.segment_rows = meta["segment_rows"]
+            self.dimensions = tuple(meta["dimensions"])
+            self._segment_counts: List[int] = meta["segments"]
+            # Stores written before the flags widened kept them as uint8
+            self.flags_dtype = meta.get("flags_dtype", "uint8")
+        else:
+            self.segment_rows = segment_rows
+            self.dimensions = tuple(dimensions)
+            self._segment_counts = []
+            self.flags_dtype = FLAGS_DTYPE
+        self.layout = column_layout(len(self.dimensions), self.flags_dtype)
+        self._writer: Optional[Dict[str, np.memmap]] = None
+
+    def __len__(self) -> int:
+        return sum(self._segment_counts)
+
+    def _column_file(self, segment: int, name: str) -> Path:
+        return self.path / f"segment-{segment:06d}" / f"{name}.bin"
+
+    def _map_segment(self, segment: int, mode: str) -> Dict[str, np.memmap]:
+        columns = {}
+        for name, (dtype, shape) in self.layout.items():
+            columns[name] = np.memmap(
+                self._column_file(segment, name),
+                dtype=dtype,
+                mode=mode,
+                shape=(self.segment_rows, *shape)
+            )
+        return columns
+
+    def _writable_segment(self) -> Dict[str, np.memmap]:
+        """Open the tail segment for appends, starting a new one when full"""
+        if not self._segment_counts or self._segment_counts[-1] == self.segment_rows:
+            self.flush()
+            self._writer = None
+            self._segment_counts.append(0)
+            self._column_file(len(self._segment_counts) - 1, "total").parent.mkdir(exist_ok=True)
+            self._writer = self._map_segment(len(self._segment_counts) - 1, "w+")
+        elif self._writer is None:
+            self._writer = self._map_segment(len(self._segment_counts) - 1, "r+")
+        return self._writer
+
+    def append(
+        self,
+        player_id: str,
+        timestamp: float,
+        difficulty: int,
+        achieved: Dict[str, float],
+        targets: Dict[str, float],
+        score_card
+    ):
+        """Write one scored action at the end of the tail segment"""
+        encoded = player_id.encode()
+        if len(encoded) > PLAYER_ID_BYTES:
+            raise ValueError(f"player id longer than {PLAYER_ID_BYTES} bytes: {player_id!r}")
+        columns = self._writable_segment()
+        row = self._segment_counts[-1]
+        columns["timestamp"][row] = timestamp
+        columns["player"][row] = encoded
+        columns["difficulty"][row] = difficulty
+        columns["achieved"][row] = [achieved[d] for d in self.dimensions]
+        columns["target"][row] = [targets[d] for d in self.dimensions]
+        columns["score"][row] = [score_card.dimension_scores[d] for d in self.dimensions]
+        columns["bonus"][row] = score_card.bonus_points
+        columns["bonus_flags"][row] = getattr(score_card, "bonus_flags", 0)
+        columns["total"][row] = score_card.total_score
+        self._segment_counts[-1] = row + 1
+
+    def on_score(self, action, scenario_context: Dict, score_card):
+        """ScoringSystem listener: store the result of calculate_score; anonymous actions are skipped"""
+        player_id = scenario_context.get("player_id")
+        if player_id is None:
+            return
+        self.append(
+            player_id,
+            action.timestamp,
+            scenario_context["difficulty"],
+            action.ethical_metrics,
+            scenario_context["ethical_dimensions"],
+            score_card
+        )
+
+    def flush(self):
+        """Persist written rows and publish the new row counts"""
+        if self._writer is not None:
+            for column in self._writer.values():
+                column.flush()
+        meta_path = self.path / self.META_FILE
+        tmp_path = meta_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({
+            "segment_rows": self.segment_rows,
+            "dimensions": list(self.dimensions),
+            "flags_dtype": self.flags_dtype,
+            "segments": self._segment_counts
+        }))
+        os.replace(tmp_path, meta_path)
+
+    def segments(self, name: str) -> Iterator[np.ndarray]:
+        """Zero-copy views of one column, segment by segment"""
+        for segment, count in enumerate(self._segment_counts):
+            if count == 0:
+                continue
+            if segment == len(self._segment_counts) - 1 and self._writer is not None:
+                yield self._writer[name][:count]
+            else:
+                dtype, shape = self.layout[name]
+                yield np.memmap(
+                    self._column_file(segment, name),
+                    dtype=dtype,
+                    mode="r",
+                    shape=(self.segment_rows, *shape)
+                )[:count]
+
+    def column(self, name: str) -> np.ndarray:
+        """Whole column as one array (copies when there are several segments)"""
+        parts = list(self.segments(name))
+        if not parts:
+            dtype, shape = self.layout[name]
+            return np.empty((0, *shape), dtype=dtype)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def close(self):
+        self.flush()
+        self._writer = None
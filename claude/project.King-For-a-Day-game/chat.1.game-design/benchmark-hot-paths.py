@@ -0,0 +1,331 @@
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+import argparse
+import itertools
+import json
+import sys
+import time
+import traceback
+import tracemalloc
+
+import numpy as np
+
+from game_modules import load_module
+
+economic_system = load_module("economic-system.py")
+scoring_system = load_module("scoring-system.py")
+scenario_system = load_module("scenario-system.py")
+engine = load_module("simulation-engine.py")
+telegram_system = load_module("telegram-system.py")
+
+DIMENSIONS = economic_system.DIMENSION_KEYS
+
+# Scale presets: population size and proposal count
+SCALES = {
+    "small": {"players": 1_000, "proposals": 10},
+    "medium": {"players": 100_000, "proposals": 1_000},
+    "large": {"players": 1_000_000, "proposals": 10_000}
+}
+
+# Scalar paths cycle through a pool of distinct inputs rather than the whole population
+SCALAR_POOL = 10_000
+
+# A case returns the operation to time and how many logical ops one call performs
+Case = Callable[[Dict[str, int], np.random.Generator], Tuple[Callable[[], object], int]]
+BENCHMARKS: Dict[str, Case] = {}
+
+def benchmark(name: str):
+    """Register a benchmark case under `name`"""
+    def register(case: Case) -> Case:
+        BENCHMARKS[name] = case
+        return case
+    return register
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    scale: str
+    ops_per_sec: float
+    p50_us: float
+    p99_us: float
+    alloc_kib_per_call: float
+    calls: int
+
+# --- Synthetic data -------------------------------------------------------
+
+def make_market_inputs(count: int, rng: np.random.Generator):
+    players, ethics = engine.random_population(count, rng, ("land", "water", "energy"))
+    community = economic_system.CommunityState(
+        average_ethics=0.5,
+        economic_health=0.5,
+        resource_distribution={"land": 100.0, "water": 100.0, "energy": 100.0},
+        social_cohesion=0.5
+    )
+    return players, ethics, community
+
+def make_actions(count: int, rng: np.random.Generator):
+    achieved = rng.uniform(0.1, 4.0, (count, len(DIMENSIONS))).tolist()
+    targets = rng.uniform(0.3, 4.0, (count, len(DIMENSIONS))).tolist()
+    difficulties = rng.integers(1, 5, count).tolist()
+    actions = [
+        scoring_system.PlayerAction(
+            description="synthetic action",
+            stakeholder_impacts={"neighbor": 0.5},
+            ethical_metrics=dict(zip(DIMENSIONS, row)),
+            timestamp=float(i)
+        )
+        for i, row in enumerate(achieved)
+    ]
+    contexts = [
+        {"difficulty": d, "ethical_dimensions": dict(zip(DIMENSIONS, row))}
+        for d, row in zip(difficulties, targets)
+    ]
+    return actions, contexts
+
+def make_context(circle: int) -> "scenario_system.Context":
+    return scenario_system.Context(
+        location="building",
+        time_frame="week",
+        social_circle=[
+            scenario_system.Stakeholder(f"person-{i}", "neighbor", ["quiet"], "direct")
+            for i in range(circle)
+        ],
+        recent_events=["rent increase", "new neighbor"],
+        constraints=[]
+    )
+
+# --- Cases ----------------------------------------------------------------
+
+@benchmark("scoring.calculate_score")
+def bench_calculate_score(scale, rng):
+    scoring = scoring_system.ScoringSystem()
+    actions, contexts = make_actions(min(scale["players"], SCALAR_POOL), rng)
+    pairs = itertools.cycle(zip(actions, contexts))
+    return lambda: scoring.calculate_score(*next(pairs)), 1
+
+@benchmark("scoring.calculate_scores_batch")
+def bench_calculate_scores_batch(scale, rng):
+    scoring = scoring_system.ScoringSystem()
+    count = scale["players"]
+    achieved = rng.uniform(0.1, 4.0, (count, len(DIMENSIONS)))
+    targets = rng.uniform(0.3, 4.0, (count, len(DIMENSIONS)))
+    difficulties = rng.integers(1, 5, count)
+    return lambda: scoring.calculate_scores_batch(achieved, targets, difficulties), count
+
+@benchmark("scoring.bonus_rules_batch")
+def bench_bonus_rules_batch(scale, rng):
+    engine = scoring_system.ScoringSystem().bonus_engine()
+    count = min(scale["players"], 100_000)
+    features = {
+        "streak": rng.integers(0, 6, count),
+        "peak_gap": rng.uniform(0, 6, count),
+        "min_impact": rng.uniform(-0.5, 1, count),
+        "mean_impact": rng.uniform(0, 1.5, count),
+        "total_impact": rng.uniform(0, 4, count)
+    }
+    return lambda: engine.flags(engine.evaluate(features)), count
+
+@benchmark("economy.simulate_market_dynamics")
+def bench_market_dynamics(scale, rng):
+    simulator = economic_system.EthicalEconomySimulator()
+    players, ethics, community = make_market_inputs(min(scale["players"], SCALAR_POOL), rng)
+    store = economic_system.PlayerStore(players, ethics)
+    records = itertools.cycle([
+        (store.market_position(i), store.ethical_score(i)) for i in range(len(store))
+    ])
+
+    def op():
+        position, score = next(records)
+        return simulator.simulate_market_dynamics(position, score, community)
+    return op, 1
+
+@benchmark("economy.simulate_market_dynamics_batch")
+def bench_market_dynamics_batch(scale, rng):
+    simulator = economic_system.EthicalEconomySimulator()
+    players, ethics, community = make_market_inputs(scale["players"], rng)
+    return lambda: simulator.simulate_market_dynamics_batch(players, ethics, community), scale["players"]
+
+def make_voters(count: int, rng: np.random.Generator):
+    _, ethics, community = make_market_inputs(count, rng)
+    voters = {
+        str(i): economic_system.EthicalScore(base, {}, impact, 0.0)
+        for i, (base, impact) in enumerate(zip(ethics.base_score.tolist(), ethics.community_impact.tolist()))
+    }
+    return voters, community
+
+@benchmark("governance.simulate_governance_cycle")
+def bench_governance_cycle(scale, rng):
+    governance = economic_system.LocalGovernanceSimulator(economic_system.EthicalEconomySimulator())
+    voters, community = make_voters(scale["players"], rng)
+    proposals = [{"support": s} for s in rng.uniform(0, 1, scale["proposals"]).tolist()]
+    return lambda: governance.simulate_governance_cycle(community, proposals, voters), 1
+
+@benchmark("governance.simulate_tallied_cycle")
+def bench_tallied_cycle(scale, rng):
+    governance = economic_system.LocalGovernanceSimulator(economic_system.EthicalEconomySimulator())
+    voters, community = make_voters(scale["players"], rng)
+    tally = economic_system.VoteTally()
+    for voter_id, score in voters.items():
+        tally.set_voter(voter_id, score)
+    proposals = [{"support": s} for s in rng.uniform(0, 1, scale["proposals"]).tolist()]
+    return lambda: governance.simulate_tallied_cycle(community, proposals, tally), 1
+
+@benchmark("scenario.generate_scenario")
+def bench_generate_scenario(scale, rng):
+    generator = scenario_system.ScenarioGenerator()
+    context = make_context(circle=20)
+    difficulties = itertools.cycle(rng.integers(1, 5, 1000).tolist())
+    return lambda: generator.generate_scenario(context, next(difficulties)), 1
+
+@benchmark("scenario.generate_scenarios")
+def bench_generate_scenarios(scale, rng):
+    generator = scenario_system.ScenarioGenerator()
+    count = min(scale["players"], 100_000)
+    contexts = [make_context(circle=20)] * count
+    difficulties = rng.integers(1, 5, count).tolist()
+    return lambda: generator.generate_scenarios(contexts, difficulties, seed=0), count
+
+def make_messages(count: int, rng: np.random.Generator) -> List[str]:
+    phrases = [
+        "Why did I get this score", "what are my options here", "how can I improve",
+        "this scoring is unfair", "the scenario is unrealistic", "you should add a new scenario",
+        "hello there", "I think the neighbor was wrong", "could you explain the points"
+    ]
+    picks = rng.integers(0, len(phrases), (count, 2)).tolist()
+    # Unique suffixes defeat the content cache so the scan itself is measured
+    return [f"{phrases[a]}? and {phrases[b]} #{i}" for i, (a, b) in enumerate(picks)]
+
+@benchmark("telegram.classify_intent")
+def bench_classify_intent(scale, rng):
+    classifier = telegram_system.INTENTS
+    messages = itertools.cycle(make_messages(min(scale["players"], SCALAR_POOL), rng))
+    return lambda: classifier.classify_uncached(next(messages)), 1
+
+# Baseline for classify_intent: the same tables scanned cue by cue with str.find
+@benchmark("telegram.classify_intent_naive")
+def bench_classify_intent_naive(scale, rng):
+    intent_classifier = telegram_system.intent_classifier
+    classifier = intent_classifier.IntentClassifier(telegram_system.INTENTS.tables, matcher=intent_classifier.NaiveScan)
+    messages = itertools.cycle(make_messages(min(scale["players"], SCALAR_POOL), rng))
+    return lambda: classifier.classify_uncached(next(messages)), 1
+
+@benchmark("telegram.classify_intent_cached")
+def bench_classify_intent_cached(scale, rng):
+    classifier = telegram_system.INTENTS
+    messages = itertools.cycle([m.rsplit(" #", 1)[0] for m in make_messages(1_000, rng)])
+    return lambda: classifier.classify(next(messages)), 1
+
+# --- Runner ---------------------------------------------------------------
+
+def run_case(
+    name: str,
+    scale_name: str,
+    min_calls: int = 5,
+    max_calls: int = 2_000,
+    time_budget: float = 1.0
+) -> BenchmarkResult:
+    """Time one case, then measure its allocations in a separate traced pass"""
+    op, ops_per_call = BENCHMARKS[name](SCALES[scale_name], np.random.default_rng(0))
+    op()  # warm-up
+
+    timings = []
+    deadline = time.perf_counter() + time_budget
+    while len(timings) < max_calls and (len(timings) < min_calls or time.perf_counter() < deadline):
+        start = time.perf_counter_ns()
+        op()
+        timings.append(time.perf_counter_ns() - start)
+    timings = np.array(timings) / 1_000
+
+    # Peak bytes allocated while a single call is in flight
+    peaks = []
+    tracemalloc.start()
+    for _ in range(min(len(timings), 50)):
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        op()
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    return BenchmarkResult(
+        name=name,
+        scale=scale_name,
+        ops_per_sec=ops_per_call * len(timings) / (timings.sum() / 1e6),
+        p50_us=float(np.percentile(timings, 50)),
+        p99_us=float(np.percentile(timings, 99)),
+        alloc_kib_per_call=float(np.mean(peaks)) / 1024,
+        calls=len(timings)
+    )
+
+def find_regressions(
+    results: List[BenchmarkResult],
+    baseline: Dict[str, Dict],
+    threshold: float,
+    selected: Callable[[str, str], bool] = lambda name, scale: True
+) -> List[str]:
+    """Cases whose throughput fell more than `threshold` below the baseline.
+
+    A baseline case that this run selected but produced no result for (it
+    crashed, or was renamed or removed) counts as a regression too.
+    """
+    regressions = []
+    measured = {f"{r.name}[{r.scale}]" for r in results}
+    for key, previous in baseline.items():
+        if key not in measured and selected(previous["name"], previous["scale"]):
+            regressions.append(f"{key}: missing from this run")
+    for result in results:
+        previous = baseline.get(f"{result.name}[{result.scale}]")
+        if previous and result.ops_per_sec < previous["ops_per_sec"] * (1 - threshold):
+            drop = 1 - result.ops_per_sec / previous["ops_per_sec"]
+            regressions.append(f"{result.name}[{result.scale}]: {drop:.0%} slower")
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the game engine hot paths")
+    parser.add_argument("--scales", default="small,medium", help="comma-separated: " + ",".join(SCALES))
+    parser.add_argument("--only", default="", help="substring filter on case names")
+    parser.add_argument("--save", help="write results as a JSON baseline")
+    parser.add_argument("--compare", help="JSON baseline to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown fraction")
+    args = parser.parse_args(argv)
+
+    scales = args.scales.split(",")
+    results = []
+    failed = False
+    for scale_name in scales:
+        for name in BENCHMARKS:
+            if args.only not in name:
+                continue
+            try:
+                result = run_case(name, scale_name)
+            except NotImplementedError as error:
+                print(f"{name:45} {scale_name:7} unavailable: {error!r}")
+                continue
+            except Exception:
+                # Keep measuring the other cases, but fail the run
+                failed = True
+                print(f"{name:45} {scale_name:7} FAILED")
+                traceback.print_exc()
+                continue
+            results.append(result)
+            print(f"{name:45} {scale_name:7} {result.ops_per_sec:14,.0f} ops/s "
+                  f"p99 {result.p99_us:10.1f} us  {result.alloc_kib_per_call:9.1f} KiB/call")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({f"{r.name}[{r.scale}]": asdict(r) for r in results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = find_regressions(
+                results,
+                json.load(f),
+                args.threshold,
+                lambda name, scale: scale in scales and args.only in name
+            )
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions or failed else 0
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
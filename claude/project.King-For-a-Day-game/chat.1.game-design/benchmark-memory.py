@@ -0,0 +1,117 @@
+from dataclasses import dataclass
+from typing import Callable, Dict
+import argparse
+import gc
+import tracemalloc
+
+import numpy as np
+
+from game_modules import load_module
+
+economic_system = load_module("economic-system.py")
+
+RESOURCE_KEYS = ("land", "water", "energy")
+
+# Non-slotted copies of the economy dataclasses: the __dict__ layout they had before slots
+@dataclass
+class DictEthicalScore:
+    base_score: float
+    dimension_scores: Dict[str, float]
+    community_impact: float
+    trend: float
+
+@dataclass
+class DictMarketPosition:
+    capital: float
+    resources: Dict[str, float]
+    influence: float
+    tax_rate: float
+    benefits: Dict[str, float]
+
+@dataclass
+class DictCommunityState:
+    average_ethics: float
+    economic_health: float
+    resource_distribution: Dict[str, float]
+    social_cohesion: float
+
+def build_records(
+    count: int,
+    rng: np.random.Generator,
+    position_type=economic_system.MarketPosition,
+    score_type=economic_system.EthicalScore,
+    community_type=economic_system.CommunityState
+):
+    """Per-player dataclasses with dict fields, plus the community they live in"""
+    values = rng.uniform(0, 1, (count, 6)).tolist()
+    positions = [
+        position_type(
+            capital=v[0] * 100,
+            resources={key: v[1] for key in RESOURCE_KEYS},
+            influence=v[2],
+            tax_rate=0.2,
+            benefits={key: 0.0 for key in economic_system.BENEFIT_KEYS}
+        )
+        for v in values
+    ]
+    scores = [
+        score_type(
+            base_score=v[3],
+            dimension_scores={key: v[4] for key in economic_system.DIMENSION_KEYS},
+            community_impact=v[5],
+            trend=0.0
+        )
+        for v in values
+    ]
+    community = community_type(0.5, 0.5, {key: 100.0 for key in RESOURCE_KEYS}, 0.5)
+    return positions, scores, community
+
+def build_dict_records(count: int, rng: np.random.Generator):
+    """The original layout: the same records with a __dict__ per instance"""
+    return build_records(count, rng, DictMarketPosition, DictEthicalScore, DictCommunityState)
+
+def build_store(count: int, rng: np.random.Generator):
+    """Struct-of-arrays layout holding the same fields"""
+    positions = economic_system.MarketPositionBatch(
+        capital=rng.uniform(0, 100, count),
+        resources=rng.uniform(0, 1, (count, len(RESOURCE_KEYS))),
+        influence=rng.uniform(0, 1, count),
+        tax_rate=np.full(count, 0.2),
+        benefits=np.zeros((count, len(economic_system.BENEFIT_KEYS))),
+        resource_keys=RESOURCE_KEYS
+    )
+    ethics = economic_system.EthicalScoreBatch(
+        base_score=rng.uniform(0, 1, count),
+        community_impact=rng.uniform(0, 1, count),
+        trend=np.zeros(count),
+        dimension_scores=rng.uniform(0, 1, (count, len(economic_system.DIMENSION_KEYS)))
+    )
+    return economic_system.PlayerStore(positions, ethics)
+
+def measure(build: Callable, count: int) -> int:
+    """Bytes still allocated after building `count` players"""
+    gc.collect()
+    tracemalloc.start()
+    layout = build(count, np.random.default_rng(0))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del layout
+    return current
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-player memory of economy layouts")
+    parser.add_argument("--players", type=int, default=100_000)
+    args = parser.parse_args()
+
+    layouts = {
+        "dataclasses + __dict__": measure(build_dict_records, args.players),
+        "slotted dataclasses": measure(build_records, args.players),
+        "PlayerStore": measure(build_store, args.players)
+    }
+    baseline = layouts["dataclasses + __dict__"]
+    print(f"players: {args.players}")
+    for name, size in layouts.items():
+        print(f"{name:24} {size / 2**20:8.1f} MiB ({size / args.players:6.0f} B/player, {baseline / size:4.1f}x reduction)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+from collections import deque
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterator, Optional, Tuple
+import json
+
+RECENT_MESSAGES = 50
+
+class ChatHistory:
+    """One chat's history: recent messages in memory, older ones on disk.
+
+    Behaves like the old conversation_history list for appends, iteration
+    and len() over the recent window; older() walks further back lazily.
+    """
+    __slots__ = ("store", "chat_id", "recent")
+
+    def __init__(self, store: "ChatHistoryStore", chat_id: str, size: int):
+        self.store = store
+        self.chat_id = chat_id
+        self.recent: Deque = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self.recent)
+
+    def __iter__(self):
+        return iter(self.recent)
+
+    def __getitem__(self, index):
+        return self.recent[index]
+
+    def append(self, message):
+        if len(self.recent) == self.recent.maxlen:
+            self.store._spill(self.chat_id, self.recent[0])
+        self.recent.append(message)
+
+    def older(self, before: Optional[float] = None, limit: Optional[int] = None) -> Iterator:
+        """Spilled messages, newest first, optionally only those before a timestamp"""
+        return self.store.older(self.chat_id, before, limit)
+
+class ChatHistoryStore:
+    """Per-chat ring buffers that spill to a shared append-only log.
+
+    Each spilled record stores the log offset of the chat's previous spilled
+    record and its sequence number within the chat, so the only per-chat
+    state kept in memory beyond the ring buffer is its newest record's offset
+    and sequence number. Reading older history follows that chain backwards,
+    one seek per message.
+
+    Every CHECKPOINT_EVERY-th record of a chat also gets a (timestamp, offset)
+    checkpoint in a second log, chained per chat the same way. older(before=)
+    walks those checkpoints to the first one older than `before` and starts
+    reading the message chain just after it, so at most CHECKPOINT_EVERY
+    newer messages are skipped one by one. This assumes a chat's timestamps
+    don't decrease, which holds for messages appended in arrival order.
+    On open both logs are scanned once to rebuild the heads.
+    """
+    LOG_FILE = "history.log"
+    INDEX_FILE = "history.idx"
+    CHECKPOINT_EVERY = 64
+
+    def __init__(
+        self,
+        path: str,
+        recent: int = RECENT_MESSAGES,
+        message_type: Optional[Callable[..., object]] = None
+    ):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.recent = recent
+        self.message_type = message_type
+        self.chats: Dict[str, ChatHistory] = {}
+        self._heads: Dict[str, Tuple[int, int]] = {}     # chat -> (offset, sequence number)
+        self._checkpoints: Dict[str, int] = {}           # chat -> newest checkpoint's index offset
+        self._log_path = self.path / self.LOG_FILE
+        self._index_path = self.path / self.INDEX_FILE
+        self._rebuild_heads()
+        self._writer = open(self._log_path, "ab")
+        self._index_writer = open(self._index_path, "ab")
+
+    @staticmethod
+    def _scan(path: Path) -> Iterator[Tuple[int, Dict]]:
+        if not path.exists():
+            return
+        offset = 0
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn final write
+                yield offset, json.loads(line)
+                offset += len(line)
+        with open(path, "r+b") as f:
+            f.truncate(offset)
+
+    def _rebuild_heads(self):
+        newest = -1
+        for offset, record in self._scan(self._log_path):
+            # Logs written before sequence numbers existed are counted instead
+            seq = record.get("seq", self._heads.get(record["chat_id"], (-1, -1))[1] + 1)
+            self._heads[record["chat_id"]] = (offset, seq)
+            newest = offset
+        for offset, checkpoint in self._scan(self._index_path):
+            if checkpoint["offset"] > newest:
+                # Points at a log record lost in a torn write; drop it and everything after
+                with open(self._index_path, "r+b") as f:
+                    f.truncate(offset)
+                break
+            self._checkpoints[checkpoint["chat_id"]] = offset
+
+    def chat(self, chat_id: str) -> ChatHistory:
+        history = self.chats.get(chat_id)
+        if history is None:
+            history = self.chats[chat_id] = ChatHistory(self, chat_id, self.recent)
+        return history
+
+    def append(self, chat_id: str, message):
+        self.chat(chat_id).append(message)
+
+    def _spill(self, chat_id: str, message):
+        fields = asdict(message) if is_dataclass(message) else dict(message)
+        prev, seq = self._heads.get(chat_id, (-1, -1))
+        seq += 1
+        record = {"chat_id": chat_id, "prev": prev, "seq": seq, "message": fields}
+        offset = self._writer.tell()
+        self._heads[chat_id] = (offset, seq)
+        self._writer.write(json.dumps(record, default=repr).encode() + b"\n")
+        if seq % self.CHECKPOINT_EVERY == 0:
+            checkpoint = {
+                "chat_id": chat_id,
+                "prev": self._checkpoints.get(chat_id, -1),
+                "timestamp": fields.get("timestamp", 0.0),
+                "offset": offset
+            }
+            self._checkpoints[chat_id] = self._index_writer.tell()
+            self._index_writer.write(json.dumps(checkpoint).encode() + b"\n")
+
+    def _start_before(self, chat_id: str, before: float) -> int:
+        """Log offset to start reading from so every message older than `before` is reached"""
+        start = self._heads.get(chat_id, (-1, -1))[0]
+        offset = self._checkpoints.get(chat_id, -1)
+        with open(self._index_path, "rb") as f:
+            while offset >= 0:
+                f.seek(offset)
+                checkpoint = json.loads(f.readline())
+                if checkpoint["timestamp"] < before:
+                    break
+                # Everything from this checkpoint on is too new
+                start = checkpoint["offset"]
+                offset = checkpoint["prev"]
+        return start
+
+    def older(
+        self,
+        chat_id: str,
+        before: Optional[float] = None,
+        limit: Optional[int] = None
+    ) -> Iterator:
+        """Walk a chat's spilled messages from newest to oldest"""
+        self.flush()
+        if before is None:
+            offset = self._heads.get(chat_id, (-1, -1))[0]
+        else:
+            offset = self._start_before(chat_id, before)
+        yielded = 0
+        with open(self._log_path, "rb") as f:
+            while offset >= 0 and (limit is None or yielded < limit):
+                f.seek(offset)
+                record = json.loads(f.readline())
+                offset = record["prev"]
+                fields = record["message"]
+                if before is not None and fields.get("timestamp", 0.0) >= before:
+                    continue
+                yielded += 1
+                yield self.message_type(**fields) if self.message_type else fields
+
+    def forget(self, chat_id: str):
+        """Release a chat's ring buffer after spilling it; its log chain stays readable"""
+        history = self.chats.pop(chat_id, None)
+        if history is not None:
+            for message in history.recent:
+                self._spill(chat_id, message)
+
+    def flush(self):
+        self._writer.flush()
+        self._index_writer.flush()
+
+    def close(self):
+        """Spill every ring buffer so nothing is lost across restarts"""
+        for chat_id in list(self.chats):
+            self.forget(chat_id)
+        self._writer.close()
+        self._index_writer.close()
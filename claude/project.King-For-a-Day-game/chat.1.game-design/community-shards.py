@@ -0,0 +1,184 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import reduce
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import os
+
+import numpy as np
+
+from game_modules import load_module
+from seeding import derive_seed
+
+economic_system = load_module("economic-system.py")
+engine = load_module("simulation-engine.py")
+CommunityState = economic_system.CommunityState
+
+Population = Tuple["economic_system.MarketPositionBatch", "economic_system.EthicalScoreBatch"]
+
+@dataclass
+class ShardSpec:
+    """One community to simulate, with its real player base or a synthetic one.
+
+    Set `population` to ship the batches to the worker, or `loader` (a
+    picklable, module-level callable) to have the worker load them itself.
+    With neither, `players` synthetic players are generated.
+    """
+    community_id: str
+    players: int
+    community: CommunityState
+    population: Optional[Population] = None
+    loader: Optional[Callable[[], Population]] = None
+
+    def load(self, rng: np.random.Generator) -> Population:
+        if self.loader is not None:
+            return self.loader()
+        if self.population is not None:
+            return self.population
+        return engine.random_population(self.players, rng, tuple(self.community.resource_distribution))
+
+def partition_population(
+    players: "economic_system.MarketPositionBatch",
+    ethics: "economic_system.EthicalScoreBatch",
+    community_of: Sequence[str],
+    communities: Dict[str, CommunityState]
+) -> List[ShardSpec]:
+    """Split one player base into a shard per community, by each player's community id"""
+    community_of = np.asarray(community_of)
+    shards = []
+    for community_id, community in communities.items():
+        rows = np.flatnonzero(community_of == community_id)
+        population = (
+            economic_system.MarketPositionBatch(
+                capital=players.capital[rows],
+                resources=players.resources[rows],
+                influence=players.influence[rows],
+                tax_rate=players.tax_rate[rows],
+                benefits=players.benefits[rows],
+                resource_keys=players.resource_keys
+            ),
+            economic_system.EthicalScoreBatch(
+                base_score=ethics.base_score[rows],
+                community_impact=ethics.community_impact[rows],
+                trend=ethics.trend[rows],
+                dimension_scores=None if ethics.dimension_scores is None else ethics.dimension_scores[rows]
+            )
+        )
+        shards.append(ShardSpec(community_id, len(rows), community, population=population))
+    return shards
+
+@dataclass
+class RunningMoments:
+    """Count, mean and sum of squared deviations, mergeable across shards"""
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    @classmethod
+    def of(cls, values: np.ndarray) -> "RunningMoments":
+        if len(values) == 0:
+            return cls()
+        mean = float(values.mean())
+        return cls(len(values), mean, float(((values - mean) ** 2).sum()))
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count else 0.0
+
+    def merge(self, other: "RunningMoments") -> "RunningMoments":
+        """Chan et al. pairwise combination"""
+        count = self.count + other.count
+        if count == 0:
+            return RunningMoments()
+        delta = other.mean - self.mean
+        mean = self.mean + delta * other.count / count
+        m2 = self.m2 + other.m2 + delta ** 2 * self.count * other.count / count
+        return RunningMoments(count, mean, m2)
+
+@dataclass
+class ShardAggregate:
+    """Per-shard summary small enough to send back to the parent process"""
+    communities: int = 0
+    ethics: RunningMoments = field(default_factory=RunningMoments)
+    capital: RunningMoments = field(default_factory=RunningMoments)
+    tax_rate: RunningMoments = field(default_factory=RunningMoments)
+    influence: RunningMoments = field(default_factory=RunningMoments)
+    resource_totals: Dict[str, float] = field(default_factory=dict)
+    # Community-level state, weighted by player count when combined
+    economic_health_sum: float = 0.0
+    social_cohesion_sum: float = 0.0
+
+    @classmethod
+    def of(
+        cls,
+        players: "economic_system.MarketPositionBatch",
+        ethics: "economic_system.EthicalScoreBatch",
+        community: CommunityState
+    ) -> "ShardAggregate":
+        count = len(players)
+        return cls(
+            communities=1,
+            ethics=RunningMoments.of(ethics.base_score),
+            capital=RunningMoments.of(players.capital),
+            tax_rate=RunningMoments.of(players.tax_rate),
+            influence=RunningMoments.of(players.influence),
+            resource_totals=dict(zip(players.resource_keys, players.resources.sum(axis=0).tolist())),
+            economic_health_sum=community.economic_health * count,
+            social_cohesion_sum=community.social_cohesion * count
+        )
+
+    def merge(self, other: "ShardAggregate") -> "ShardAggregate":
+        resource_totals = dict(self.resource_totals)
+        for resource, total in other.resource_totals.items():
+            resource_totals[resource] = resource_totals.get(resource, 0.0) + total
+        return ShardAggregate(
+            communities=self.communities + other.communities,
+            ethics=self.ethics.merge(other.ethics),
+            capital=self.capital.merge(other.capital),
+            tax_rate=self.tax_rate.merge(other.tax_rate),
+            influence=self.influence.merge(other.influence),
+            resource_totals=resource_totals,
+            economic_health_sum=self.economic_health_sum + other.economic_health_sum,
+            social_cohesion_sum=self.social_cohesion_sum + other.social_cohesion_sum
+        )
+
+    def community_state(self) -> CommunityState:
+        """Population-weighted CommunityState across everything merged so far"""
+        count = self.ethics.count or 1
+        return CommunityState(
+            average_ethics=self.ethics.mean,
+            economic_health=self.economic_health_sum / count,
+            resource_distribution=dict(self.resource_totals),
+            social_cohesion=self.social_cohesion_sum / count
+        )
+
+def run_shard(spec: ShardSpec, rounds: int, seed: int) -> Tuple[str, ShardAggregate]:
+    """Simulate one community inside a worker and return only its aggregate"""
+    # Separate streams for the population and the simulation, as in parameter-sweep's run_point
+    rng = np.random.default_rng(derive_seed(seed, 0))
+    economy = economic_system.EthicalEconomySimulator()
+    governance = economic_system.LocalGovernanceSimulator(economy)
+    players, ethics = spec.load(rng)
+
+    simulation = engine.SimulationEngine(
+        economy, governance, players, ethics, spec.community, seed=derive_seed(seed, 1)
+    )
+    for _ in simulation.run(rounds):
+        pass
+
+    return spec.community_id, ShardAggregate.of(
+        simulation.players, simulation.ethics, simulation.community
+    )
+
+def run_sharded(
+    shards: List[ShardSpec],
+    rounds: int,
+    seed: int = 0,
+    workers: Optional[int] = None
+) -> Tuple[Dict[str, ShardAggregate], ShardAggregate]:
+    """Map communities over a process pool, then reduce their aggregates"""
+    seeds = [derive_seed(seed, i) for i in range(len(shards))]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        per_shard = dict(pool.map(run_shard, shards, [rounds] * len(shards), seeds))
+
+    total = reduce(ShardAggregate.merge, per_shard.values(), ShardAggregate())
+    return per_shard, total
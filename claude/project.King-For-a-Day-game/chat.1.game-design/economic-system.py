@@ -1,15 +1,19 @@
+from collections.abc import Mapping
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import heapq
 import math
 
-@dataclass
+import numpy as np
+
+@dataclass(slots=True)
 class EthicalScore:
     base_score: float
     dimension_scores: Dict[str, float]
     community_impact: float
     trend: float  # Rate of improvement
 
-@dataclass
+@dataclass(slots=True)
 class MarketPosition:
     capital: float
     resources: Dict[str, float]
@@ -17,18 +21,310 @@ class MarketPosition:
     tax_rate: float
     benefits: Dict[str, float]
 
-@dataclass
+@dataclass(slots=True)
 class CommunityState:
     average_ethics: float
     economic_health: float
     resource_distribution: Dict[str, float]
     social_cohesion: float
 
-class EthicalEconomySimulator:
+BENEFIT_KEYS = ("tax_refund", "resource_bonus", "influence_multiplier", "innovation_access")
+DIMENSION_KEYS = ("openness", "respect", "accountability", "practice", "validation", "outcomes")
+
+@dataclass
+class EthicalScoreBatch:
+    """Columnar ethical scores for a whole population (one row per player)"""
+    base_score: np.ndarray        # (N,)
+    community_impact: np.ndarray  # (N,)
+    trend: np.ndarray             # (N,)
+    dimension_scores: Optional[np.ndarray] = None  # (N, D), not used by the economy
+
+    def __len__(self) -> int:
+        return len(self.base_score)
+
+@dataclass
+class MarketPositionBatch:
+    """Columnar market positions, resource and benefit columns follow the key tuples"""
+    capital: np.ndarray     # (N,)
+    resources: np.ndarray   # (N, R)
+    influence: np.ndarray   # (N,)
+    tax_rate: np.ndarray    # (N,)
+    benefits: np.ndarray    # (N, len(BENEFIT_KEYS))
+    resource_keys: Tuple[str, ...] = ()
+
+    def __len__(self) -> int:
+        return len(self.capital)
+
+class ArrayMap(Mapping):
+    """Dict-like view over one array row with a fixed key schema"""
+    __slots__ = ("_row", "_index")
+
+    def __init__(self, row: np.ndarray, index: Dict[str, int]):
+        self._row = row
+        self._index = index
+
+    def __getitem__(self, key: str) -> float:
+        return float(self._row[self._index[key]])
+
+    def __setitem__(self, key: str, value: float):
+        self._row[self._index[key]] = value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def copy(self) -> Dict[str, float]:
+        return dict(zip(self._index, self._row.tolist()))
+
+def _assign_row(row: np.ndarray, index: Dict[str, int], values: Mapping):
+    """Replace a whole row from a mapping, as assigning a new dict would"""
+    values = dict(values)  # may be a view of this very row
+    unknown = set(values) - set(index)
+    if unknown:
+        raise KeyError(f"Not in the store's key schema: {sorted(unknown)}")
+    row[:] = 0.0
+    for key, value in values.items():
+        row[index[key]] = value
+
+class _Column:
+    """Descriptor reading and writing one scalar column of a PlayerStore"""
+    __slots__ = ("batch", "name")
+
+    def __init__(self, batch: str, name: str):
+        self.batch = batch
+        self.name = name
+
+    def __get__(self, view, owner=None):
+        if view is None:
+            return self
+        return float(getattr(getattr(view._store, self.batch), self.name)[view._row])
+
+    def __set__(self, view, value: float):
+        getattr(getattr(view._store, self.batch), self.name)[view._row] = value
+
+class EthicalScoreView:
+    """EthicalScore-compatible view of one player in a PlayerStore"""
+    __slots__ = ("_store", "_row")
+    base_score = _Column("ethics", "base_score")
+    community_impact = _Column("ethics", "community_impact")
+    trend = _Column("ethics", "trend")
+
+    def __init__(self, store: "PlayerStore", row: int):
+        self._store = store
+        self._row = row
+
+    @property
+    def dimension_scores(self) -> ArrayMap:
+        return ArrayMap(self._store.ethics.dimension_scores[self._row], self._store.dimension_index)
+
+    @dimension_scores.setter
+    def dimension_scores(self, values: Mapping):
+        _assign_row(self._store.ethics.dimension_scores[self._row], self._store.dimension_index, values)
+
+class MarketPositionView:
+    """MarketPosition-compatible view of one player in a PlayerStore"""
+    __slots__ = ("_store", "_row")
+    capital = _Column("positions", "capital")
+    influence = _Column("positions", "influence")
+    tax_rate = _Column("positions", "tax_rate")
+
+    def __init__(self, store: "PlayerStore", row: int):
+        self._store = store
+        self._row = row
+
+    @property
+    def resources(self) -> ArrayMap:
+        return ArrayMap(self._store.positions.resources[self._row], self._store.resource_index)
+
+    @resources.setter
+    def resources(self, values: Mapping):
+        _assign_row(self._store.positions.resources[self._row], self._store.resource_index, values)
+
+    @property
+    def benefits(self) -> ArrayMap:
+        return ArrayMap(self._store.positions.benefits[self._row], self._store.benefit_index)
+
+    @benefits.setter
+    def benefits(self, values: Mapping):
+        _assign_row(self._store.positions.benefits[self._row], self._store.benefit_index, values)
+
+class PlayerStore:
+    """Struct-of-arrays player state that hands out lightweight per-player views"""
+    def __init__(
+        self,
+        positions: MarketPositionBatch,
+        ethics: EthicalScoreBatch,
+        dimension_keys: Tuple[str, ...] = DIMENSION_KEYS
+    ):
+        if ethics.dimension_scores is None:
+            ethics.dimension_scores = np.zeros((len(ethics), len(dimension_keys)))
+        self.positions = positions
+        self.ethics = ethics
+        self.dimension_index = {key: i for i, key in enumerate(dimension_keys)}
+        self.resource_index = {key: i for i, key in enumerate(positions.resource_keys)}
+        self.benefit_index = {key: i for i, key in enumerate(BENEFIT_KEYS)}
+
+    @classmethod
+    def from_records(
+        cls,
+        positions: Sequence[MarketPosition],
+        scores: Sequence[EthicalScore],
+        resource_keys: Tuple[str, ...],
+        dimension_keys: Tuple[str, ...] = DIMENSION_KEYS
+    ) -> "PlayerStore":
+        """Pack existing dataclass records into columns"""
+        def matrix(maps, keys):
+            return np.array([[m.get(k, 0.0) for k in keys] for m in maps], dtype=float).reshape(len(maps), len(keys))
+
+        batch = MarketPositionBatch(
+            capital=np.array([p.capital for p in positions], dtype=float),
+            resources=matrix([p.resources for p in positions], resource_keys),
+            influence=np.array([p.influence for p in positions], dtype=float),
+            tax_rate=np.array([p.tax_rate for p in positions], dtype=float),
+            benefits=matrix([p.benefits for p in positions], BENEFIT_KEYS),
+            resource_keys=tuple(resource_keys)
+        )
+        ethics = EthicalScoreBatch(
+            base_score=np.array([s.base_score for s in scores], dtype=float),
+            community_impact=np.array([s.community_impact for s in scores], dtype=float),
+            trend=np.array([s.trend for s in scores], dtype=float),
+            dimension_scores=matrix([s.dimension_scores for s in scores], dimension_keys)
+        )
+        return cls(batch, ethics, dimension_keys)
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def ethical_score(self, row: int) -> EthicalScoreView:
+        return EthicalScoreView(self, row)
+
+    def market_position(self, row: int) -> MarketPositionView:
+        return MarketPositionView(self, row)
+
+@dataclass(slots=True)
+class PlayerDelta:
+    """Change to one player's contribution to the community aggregates"""
+    player_id: str
+    joined: int = 0  # +1 new player, -1 player left
+    old_score: float = 0.0
+    new_score: float = 0.0
+    impact_delta: float = 0.0
+    resource_deltas: Optional[Dict[str, float]] = None
+
+class CommunityAggregator:
+    """Event-sourced community aggregates, updated in O(1) per player change"""
     def __init__(self):
+        self.count = 0
+        self.mean_ethics = 0.0
+        self._ethics_m2 = 0.0
+        self.impact_total = 0.0
+        self.resource_totals: Dict[str, float] = {}
+        self._scores: Dict[str, Tuple[float, float]] = {}
+        self._resources: Dict[str, Dict[str, float]] = {}
+
+    @property
+    def ethics_variance(self) -> float:
+        return self._ethics_m2 / self.count if self.count else 0.0
+
+    @property
+    def mean_impact(self) -> float:
+        return self.impact_total / self.count if self.count else 0.0
+
+    def record_score(self, player_id: str, score: EthicalScore) -> PlayerDelta:
+        """Emit and apply the delta for a player's new ethical score"""
+        previous = self._scores.get(player_id)
+        self._scores[player_id] = (score.base_score, score.community_impact)
+        if previous is None:
+            delta = PlayerDelta(
+                player_id,
+                joined=1,
+                new_score=score.base_score,
+                impact_delta=score.community_impact
+            )
+        else:
+            delta = PlayerDelta(
+                player_id,
+                old_score=previous[0],
+                new_score=score.base_score,
+                impact_delta=score.community_impact - previous[1]
+            )
+        self.apply(delta)
+        return delta
+
+    def record_resources(self, player_id: str, resources: Dict[str, float]) -> PlayerDelta:
+        """Emit and apply the delta for a player's new resource holdings"""
+        previous = self._resources.get(player_id, {})
+        self._resources[player_id] = dict(resources)
+        deltas = {
+            key: resources.get(key, 0.0) - previous.get(key, 0.0)
+            for key in resources.keys() | previous.keys()
+        }
+        delta = PlayerDelta(player_id, resource_deltas=deltas)
+        self.apply(delta)
+        return delta
+
+    def remove_player(self, player_id: str) -> PlayerDelta:
+        """Emit and apply the delta for a player leaving the community"""
+        base_score, impact = self._scores.pop(player_id)
+        resources = self._resources.pop(player_id, {})
+        delta = PlayerDelta(
+            player_id,
+            joined=-1,
+            old_score=base_score,
+            impact_delta=-impact,
+            resource_deltas={key: -amount for key, amount in resources.items()}
+        )
+        self.apply(delta)
+        return delta
+
+    def apply(self, delta: PlayerDelta):
+        """Fold a delta into the aggregates (Welford add, remove or replace)"""
+        if delta.joined > 0:
+            self.count += 1
+            shift = delta.new_score - self.mean_ethics
+            self.mean_ethics += shift / self.count
+            self._ethics_m2 += shift * (delta.new_score - self.mean_ethics)
+        elif delta.joined < 0:
+            self.count -= 1
+            if self.count == 0:
+                self.mean_ethics = self._ethics_m2 = 0.0
+            else:
+                shift = delta.old_score - self.mean_ethics
+                self.mean_ethics -= shift / self.count
+                self._ethics_m2 -= shift * (delta.old_score - self.mean_ethics)
+        elif delta.new_score != delta.old_score:
+            old_mean = self.mean_ethics
+            self.mean_ethics += (delta.new_score - delta.old_score) / self.count
+            self._ethics_m2 += (delta.new_score - delta.old_score) * (
+                delta.new_score - self.mean_ethics + delta.old_score - old_mean
+            )
+
+        self.impact_total += delta.impact_delta
+        for key, amount in (delta.resource_deltas or {}).items():
+            self.resource_totals[key] = self.resource_totals.get(key, 0.0) + amount
+
+    def refresh(self, community: CommunityState) -> CommunityState:
+        """Community state with ethics and resources taken from the aggregates.
+
+        Each field is only overridden once events for it have been recorded,
+        so an aggregator fed only scores keeps the community's resource pool.
+        """
+        return CommunityState(
+            average_ethics=self.mean_ethics if self.count else community.average_ethics,
+            economic_health=community.economic_health,
+            resource_distribution=dict(self.resource_totals) if self._resources else community.resource_distribution,
+            social_cohesion=community.social_cohesion
+        )
+
+class EthicalEconomySimulator:
+    def __init__(self, aggregator: Optional[CommunityAggregator] = None):
         self.base_tax_rate = 0.2
         self.ethics_multiplier = 0.5
         self.community_bonus = 0.3
+        # When set, market dynamics always read live community aggregates
+        self.aggregator = aggregator
         
     def calculate_effective_tax_rate(self, ethical_score: EthicalScore) -> float:
         """Calculate tax rate based on ethical behavior"""
@@ -51,6 +347,9 @@ class EthicalEconomySimulator:
         community: CommunityState
     ) -> MarketPosition:
         """Simulate market outcomes based on ethics and community state"""
+        if self.aggregator is not None:
+            community = self.aggregator.refresh(community)
+
         # Calculate economic benefits
         benefit_multiplier = self._calculate_benefit_multiplier(ethical_score, community)
         
@@ -147,9 +446,113 @@ class EthicalEconomySimulator:
             "innovation_access": (ethics.base_score > 0.8) * 100
         }
 
+    def simulate_market_dynamics_batch(
+        self,
+        players: MarketPositionBatch,
+        ethics: EthicalScoreBatch,
+        community: CommunityState
+    ) -> MarketPositionBatch:
+        """Vectorized simulate_market_dynamics over a whole population"""
+        if self.aggregator is not None:
+            community = self.aggregator.refresh(community)
+
+        base = ethics.base_score
+        impact = ethics.community_impact
+
+        # Economic benefits, same terms as _calculate_benefit_multiplier
+        benefit_multiplier = (
+            base * 0.2
+            + np.maximum(0, (base - community.average_ethics) * 0.1)
+            + np.where(base > 0.8, 0.05, 0.0)
+        )
+        new_capital = players.capital * (1 + benefit_multiplier)
+
+        # Resource access: one outer product against the community distribution
+        resource_keys = tuple(community.resource_distribution)
+        community_resources = np.fromiter(
+            community.resource_distribution.values(), dtype=float, count=len(resource_keys)
+        )
+        access_multiplier = (base + impact) / 2
+        resource_access = access_multiplier[:, None] * community_resources[None, :]
+
+        # Social influence
+        influence_growth = base * impact
+        cohesion_factor = math.sqrt(community.social_cohesion)
+        new_influence = np.minimum(1.0, players.influence * (1 + influence_growth * cohesion_factor))
+
+        new_tax_rate = self.calculate_effective_tax_rate_batch(ethics)
+        new_benefits = self._calculate_benefits_batch(ethics, new_tax_rate, community)
+
+        return MarketPositionBatch(
+            capital=new_capital,
+            resources=resource_access,
+            influence=new_influence,
+            tax_rate=new_tax_rate,
+            benefits=new_benefits,
+            resource_keys=resource_keys
+        )
+
+    def calculate_effective_tax_rate_batch(self, ethics: EthicalScoreBatch) -> np.ndarray:
+        """Vectorized calculate_effective_tax_rate"""
+        ethics_adjustment = (1 - ethics.base_score) * self.ethics_multiplier
+        community_bonus = ethics.community_impact * self.community_bonus
+        trend_bonus = np.maximum(0, ethics.trend * 0.1)
+
+        effective_rate = self.base_tax_rate + ethics_adjustment - community_bonus - trend_bonus
+        return np.clip(effective_rate, 0.05, 0.5)
+
+    def _calculate_benefits_batch(
+        self,
+        ethics: EthicalScoreBatch,
+        tax_rate: np.ndarray,
+        community: CommunityState
+    ) -> np.ndarray:
+        """Benefits matrix with columns in BENEFIT_KEYS order"""
+        benefits = np.empty((len(tax_rate), len(BENEFIT_KEYS)))
+        benefits[:, 0] = np.maximum(0, self.base_tax_rate - tax_rate) * 100
+        benefits[:, 1] = ethics.base_score * community.economic_health * 100
+        benefits[:, 2] = (1 + ethics.community_impact) * 100
+        benefits[:, 3] = (ethics.base_score > 0.8) * 100
+        return benefits
+
+class VoteTally:
+    """Running total of voter weight, kept current as voters change"""
+    def __init__(self, voter_ethics: Optional[Dict[str, EthicalScore]] = None):
+        self._weights: Dict[str, float] = {}
+        self.total_weight = 0.0
+        for voter_id, score in (voter_ethics or {}).items():
+            self.set_voter(voter_id, score)
+
+    def __len__(self) -> int:
+        return len(self._weights)
+
+    def set_voter(self, voter_id: str, score: EthicalScore):
+        """Add a voter or replace their score in O(1)"""
+        weight = score.base_score * score.community_impact
+        self.total_weight += weight - self._weights.get(voter_id, 0.0)
+        self._weights[voter_id] = weight
+
+    def remove_voter(self, voter_id: str):
+        """Drop a voter's weight from the total"""
+        self.total_weight -= self._weights.pop(voter_id, 0.0)
+
+    def resync(self):
+        """Recompute the total exactly to shed accumulated rounding drift"""
+        self.total_weight = math.fsum(self._weights.values())
+
 class LocalGovernanceSimulator:
-    def __init__(self, economy: EthicalEconomySimulator):
+    """Voting and policy application for one community.
+
+    Each proposal's support is scaled by the voters' combined weight
+    (base_score * community_impact per voter). With `mean_vote_weight` (the
+    default) that weight is averaged over the voters, so a policy's effect
+    does not grow with the size of the population; set it to False for the
+    original model, which sums the weights. Every cycle method (dict, batch
+    and tallied) applies the same setting.
+    """
+    def __init__(self, economy: EthicalEconomySimulator, mean_vote_weight: bool = True):
         self.economy = economy
+        self.mean_vote_weight = mean_vote_weight
         self.policy_weights = {
             "tax_rate": 0.3,
             "resource_distribution": 0.3,
@@ -175,33 +578,72 @@ class LocalGovernanceSimulator:
         
         return new_community
 
+    def simulate_governance_cycle_batch(
+        self,
+        community: CommunityState,
+        proposals: List[Dict],
+        voter_ethics: EthicalScoreBatch
+    ) -> CommunityState:
+        """Governance cycle over columnar voter ethics"""
+        total = float(np.dot(voter_ethics.base_score, voter_ethics.community_impact))
+        weighted_votes = self._weight_proposals(self._vote_weight(total, len(voter_ethics)), proposals)
+        winning_policies = self._select_winning_policies(weighted_votes)
+        return self._apply_policies(community, winning_policies)
+
+    def simulate_tallied_cycle(
+        self,
+        community: CommunityState,
+        proposals: List[Dict],
+        tally: VoteTally
+    ) -> CommunityState:
+        """Governance cycle using an incrementally maintained vote tally"""
+        weighted_votes = self._weight_proposals(self._vote_weight(tally.total_weight, len(tally)), proposals)
+        winning_policies = self._select_winning_policies(weighted_votes)
+        return self._apply_policies(community, winning_policies)
+
+    def _vote_weight(self, total: float, count: int) -> float:
+        """Combined voter weight under the configured model"""
+        if not self.mean_vote_weight:
+            return total
+        return total / count if count else 0.0
+
+    def _weight_proposals(
+        self,
+        vote_weight: float,
+        proposals: List[Dict]
+    ) -> Dict[str, float]:
+        """Scale each proposal's support by the combined voter weight"""
+        return {
+            str(proposal_id): vote_weight * proposal.get("support", 0)
+            for proposal_id, proposal in enumerate(proposals)
+        }
+
     def _calculate_weighted_votes(
         self,
         voter_ethics: Dict[str, EthicalScore],
         proposals: List[Dict]
     ) -> Dict[str, float]:
         """Calculate weighted votes based on ethical scores"""
-        weighted_votes = {}
-        for proposal_id, proposal in enumerate(proposals):
-            vote_weight = sum(
-                score.base_score * score.community_impact
-                for score in voter_ethics.values()
-            )
-            weighted_votes[str(proposal_id)] = vote_weight * proposal.get("support", 0)
-        return weighted_votes
+        # The voter weight does not depend on the proposal, so sum it once
+        vote_weight = sum(
+            score.base_score * score.community_impact
+            for score in voter_ethics.values()
+        )
+        return self._weight_proposals(self._vote_weight(vote_weight, len(voter_ethics)), proposals)
 
     def _select_winning_policies(
         self,
-        weighted_votes: Dict[str, float]
+        weighted_votes: Dict[str, float],
+        count: int = 3
     ) -> List[Dict]:
         """Select winning policy proposals"""
-        # Sort by weighted votes and return top policies
-        sorted_proposals = sorted(
+        # Partial selection of the top policies, same order as a full sort
+        top_proposals = heapq.nlargest(
+            count,
             weighted_votes.items(),
-            key=lambda x: x[1],
-            reverse=True
+            key=lambda x: x[1]
         )
-        return [{"id": p[0], "weight": p[1]} for p in sorted_proposals[:3]]
+        return [{"id": p[0], "weight": p[1]} for p in top_proposals]
 
     def _apply_policies(
         self,
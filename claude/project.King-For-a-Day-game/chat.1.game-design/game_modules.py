@@ -0,0 +1,20 @@
+"""Load the hyphen-named game design files as regular Python modules"""
+from pathlib import Path
+from types import ModuleType
+import importlib.util
+import sys
+
+_HERE = Path(__file__).parent
+
+def load_module(filename: str) -> ModuleType:
+    """Import a sibling file such as 'economic-system.py' once and cache it"""
+    name = filename[:-len(".py")].replace("-", "_")
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.spec_from_file_location(name, _HERE / filename)
+    module = importlib.util.module_from_spec(spec)
+    # Register before executing so dataclasses and pickling can resolve the name
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,205 @@
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+import random
+import time
+
+# Entries are ordered by (score, player_id) so equal scores stay distinct
+Entry = Tuple[float, str]
+
+class _Node:
+    __slots__ = ("key", "priority", "left", "right", "size")
+
+    def __init__(self, key: Entry, priority: float):
+        self.key = key
+        self.priority = priority
+        self.left: Optional["_Node"] = None
+        self.right: Optional["_Node"] = None
+        self.size = 1
+
+def _size(node: Optional[_Node]) -> int:
+    return node.size if node else 0
+
+def _update(node: _Node):
+    node.size = 1 + _size(node.left) + _size(node.right)
+
+def _split(node: Optional[_Node], key: Entry) -> Tuple[Optional[_Node], Optional[_Node]]:
+    """Split into nodes < key and nodes >= key"""
+    if node is None:
+        return None, None
+    if node.key < key:
+        node.right, right = _split(node.right, key)
+        _update(node)
+        return node, right
+    left, node.left = _split(node.left, key)
+    _update(node)
+    return left, node
+
+def _merge(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    """Join two treaps where every key in `left` is below every key in `right`"""
+    if left is None or right is None:
+        return left or right
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update(left)
+        return left
+    right.left = _merge(left, right.left)
+    _update(right)
+    return right
+
+def _erase(node: Optional[_Node], key: Entry) -> Optional[_Node]:
+    if node is None:
+        return None
+    if key == node.key:
+        return _merge(node.left, node.right)
+    if key < node.key:
+        node.left = _erase(node.left, key)
+    else:
+        node.right = _erase(node.right, key)
+    _update(node)
+    return node
+
+class OrderStatisticTree:
+    """Size-augmented treap: insert, remove, rank and select in O(log n)"""
+    def __init__(self, seed: Optional[int] = None):
+        self._root: Optional[_Node] = None
+        self._random = random.Random(seed)
+
+    def __len__(self) -> int:
+        return _size(self._root)
+
+    def insert(self, key: Entry):
+        left, right = _split(self._root, key)
+        self._root = _merge(_merge(left, _Node(key, self._random.random())), right)
+
+    def remove(self, key: Entry):
+        self._root = _erase(self._root, key)
+
+    def count_above(self, score: float, inclusive: bool = False) -> int:
+        """Number of entries with a higher score (or equal, if inclusive)"""
+        count, node = 0, self._root
+        while node is not None:
+            if node.key[0] > score or (inclusive and node.key[0] == score):
+                count += 1 + _size(node.right)
+                node = node.left
+            else:
+                node = node.right
+        return count
+
+    def select_from_top(self, index: int) -> Entry:
+        """Entry at `index` when ordered from highest to lowest"""
+        node = self._root
+        while node is not None:
+            above = _size(node.right)
+            if index < above:
+                node = node.right
+            elif index == above:
+                return node.key
+            else:
+                index -= above + 1
+                node = node.left
+        raise IndexError(index)
+
+    def iter_from_top(self) -> Iterator[Entry]:
+        """Entries from highest to lowest, lazily"""
+        stack, node = [], self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.right
+            node = stack.pop()
+            yield node.key
+            node = node.left
+
+@dataclass
+class Standing:
+    rank: int          # 1-based
+    total: int
+    top_fraction: float  # 0.07 means "top 7%"
+
+class LeaderboardIndex:
+    """Live leaderboards keyed by difficulty and time window.
+
+    Each board holds every player's best score in that window. Register
+    `on_score` as a ScoringSystem listener to feed it from calculate_score.
+    """
+    def __init__(self, window_seconds: float = 7 * 24 * 3600):
+        self.window_seconds = window_seconds
+        self._boards: Dict[Tuple[int, int], OrderStatisticTree] = {}
+        self._best: Dict[Tuple[int, int], Dict[str, float]] = {}
+
+    def window_of(self, timestamp: float) -> int:
+        return int(timestamp // self.window_seconds)
+
+    def _key(self, difficulty: int, timestamp: Optional[float]) -> Tuple[int, int]:
+        return difficulty, self.window_of(time.time() if timestamp is None else timestamp)
+
+    def record(self, player_id: str, score: float, difficulty: int, timestamp: float):
+        """Insert a score, replacing the player's entry only if it improves"""
+        key = self._key(difficulty, timestamp)
+        board = self._boards.setdefault(key, OrderStatisticTree())
+        best = self._best.setdefault(key, {})
+        previous = best.get(player_id)
+        if previous is not None:
+            if score <= previous:
+                return
+            board.remove((previous, player_id))
+        board.insert((score, player_id))
+        best[player_id] = score
+
+    def on_score(self, action, scenario_context: Dict, score_card):
+        """ScoringSystem listener: index the result of calculate_score"""
+        player_id = scenario_context.get("player_id")
+        if player_id is not None:
+            self.record(
+                player_id,
+                score_card.total_score,
+                scenario_context["difficulty"],
+                action.timestamp
+            )
+
+    def standing(
+        self,
+        player_id: str,
+        difficulty: int,
+        timestamp: Optional[float] = None
+    ) -> Optional[Standing]:
+        """Rank and top-percentage of a player's best score"""
+        key = self._key(difficulty, timestamp)
+        score = self._best.get(key, {}).get(player_id)
+        if score is None:
+            return None
+        board = self._boards[key]
+        rank = board.count_above(score) + 1
+        return Standing(rank=rank, total=len(board), top_fraction=rank / len(board))
+
+    def percentile(
+        self,
+        score: float,
+        difficulty: int,
+        timestamp: Optional[float] = None
+    ) -> float:
+        """Fraction of board entries strictly below `score`"""
+        board = self._boards.get(self._key(difficulty, timestamp))
+        if not board:
+            return 0.0
+        return (len(board) - board.count_above(score, inclusive=True)) / len(board)
+
+    def top(
+        self,
+        k: int,
+        difficulty: int,
+        timestamp: Optional[float] = None
+    ) -> List[Entry]:
+        """Best k (score, player_id) entries, highest first"""
+        board = self._boards.get(self._key(difficulty, timestamp))
+        if not board:
+            return []
+        entries = board.iter_from_top()
+        return [next(entries) for _ in range(min(k, len(board)))]
+
+    def prune(self, before: float):
+        """Drop boards whose window ended before `before`"""
+        oldest = self.window_of(before)
+        for key in [key for key in self._boards if key[1] < oldest]:
+            del self._boards[key]
+            del self._best[key]
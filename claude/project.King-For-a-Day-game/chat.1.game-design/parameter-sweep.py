@@ -0,0 +1,194 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, fields
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import os
+
+import numpy as np
+
+from game_modules import load_module
+from seeding import derive_seed
+
+economic_system = load_module("economic-system.py")
+engine = load_module("simulation-engine.py")
+
+# Parameters are flat names; "policy_weights.<key>" targets the governance weights
+ECONOMY_PARAMETERS = ("base_tax_rate", "ethics_multiplier", "community_bonus")
+
+# policy_weights.* can still be swept explicitly, but no simulation path reads
+# them yet, so they are left out of the default sampling
+DEFAULT_RANGES = {
+    "base_tax_rate": (0.1, 0.35),
+    "ethics_multiplier": (0.2, 0.8),
+    "community_bonus": (0.1, 0.5)
+}
+
+SUMMARY_FIELDS = [f.name for f in fields(engine.RoundSummary) if f.name != "round"]
+
+def grid_points(space: Dict[str, Sequence[float]]) -> List[Dict[str, float]]:
+    """Every combination of the listed values"""
+    names = sorted(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[n] for n in names))]
+
+def random_points(
+    ranges: Dict[str, Tuple[float, float]],
+    count: int,
+    seed: int = 0
+) -> List[Dict[str, float]]:
+    """Uniform random draws inside each (low, high) range"""
+    rng = np.random.default_rng(seed)
+    names = sorted(ranges)
+    lows = np.array([ranges[n][0] for n in names])
+    highs = np.array([ranges[n][1] for n in names])
+    draws = rng.uniform(lows, highs, size=(count, len(names)))
+    return [dict(zip(names, map(float, row))) for row in draws]
+
+def point_seed(root_seed: int, index: int) -> int:
+    """Reproducible seed for one combination, independent of scheduling order"""
+    return derive_seed(root_seed, index)
+
+def build_simulators(params: Dict[str, float]):
+    """Economy and governance simulators configured with one combination"""
+    economy = economic_system.EthicalEconomySimulator()
+    governance = economic_system.LocalGovernanceSimulator(economy)
+    for name, value in params.items():
+        if name in ECONOMY_PARAMETERS:
+            setattr(economy, name, value)
+        elif name.startswith("policy_weights."):
+            governance.policy_weights[name.split(".", 1)[1]] = value
+        else:
+            raise ValueError(f"Unknown sweep parameter: {name}")
+    return economy, governance
+
+def run_point(
+    index: int,
+    params: Dict[str, float],
+    players: int,
+    rounds: int,
+    seed: int
+) -> Dict[str, float]:
+    """Simulate one combination and return its results row"""
+    # Separate streams for the initial population and the simulation itself
+    rng = np.random.default_rng(derive_seed(seed, 0))
+    economy, governance = build_simulators(params)
+    community = economic_system.CommunityState(
+        average_ethics=0.5,
+        economic_health=0.5,
+        resource_distribution={"land": 100.0, "water": 100.0, "energy": 100.0},
+        social_cohesion=0.5
+    )
+    population, ethics = engine.random_population(
+        players, rng, tuple(community.resource_distribution)
+    )
+
+    simulation = engine.SimulationEngine(
+        economy, governance, population, ethics, community, seed=derive_seed(seed, 1)
+    )
+    summary = None
+    for summary in simulation.run(rounds):
+        pass
+
+    row = {"index": index, "seed": seed, **params}
+    row.update({name: value for name, value in asdict(summary).items() if name in SUMMARY_FIELDS})
+    return row
+
+def completed_indices(results_path: Path) -> Set[int]:
+    """Indices of complete rows in a partially written results table.
+
+    Stray header lines and rows cut short by an interrupted write are skipped,
+    so those points simply run again.
+    """
+    if not results_path.exists():
+        return set()
+    with results_path.open(newline="") as f:
+        return {
+            int(row["index"]) for row in csv.DictReader(f)
+            if row["index"].isdigit() and None not in row.values()
+        }
+
+def sweep_signature(points: List[Dict[str, float]], players: int, rounds: int, seed: int) -> str:
+    """Hash of everything that decides a sweep's rows"""
+    encoded = json.dumps([points, players, rounds, seed], sort_keys=True).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+def check_signature(results_path: Path, signature: str):
+    """Refuse to resume a results table written by a different sweep"""
+    signature_path = results_path.with_name(results_path.name + ".sweep")
+    if signature_path.exists():
+        if signature_path.read_text().strip() != signature:
+            raise ValueError(
+                f"{results_path} was written by a sweep with different points, "
+                "players, rounds or seed; use a new results file"
+            )
+    else:
+        signature_path.write_text(signature + "\n")
+
+def run_sweep(
+    points: List[Dict[str, float]],
+    results_path: str,
+    players: int = 10_000,
+    rounds: int = 52,
+    seed: int = 0,
+    workers: Optional[int] = None
+) -> Iterator[Dict[str, float]]:
+    """Fan combinations out over a process pool, appending rows as they finish.
+
+    Rows already in `results_path` are skipped, so rerunning the same sweep
+    resumes it; a sidecar `<results>.sweep` signature makes resuming with
+    other points, players, rounds or seed an error. Governance policies only ever raise social_cohesion and
+    economic_health, so both reach their 1.0 cap after a few dozen rounds;
+    compare them over shorter horizons.
+    """
+    results_path = Path(results_path)
+    check_signature(results_path, sweep_signature(points, players, rounds, seed))
+    done = completed_indices(results_path)
+    pending = [(i, p) for i, p in enumerate(points) if i not in done]
+    if not pending:
+        return
+
+    columns = ["index", "seed", *sorted(points[0]), *SUMMARY_FIELDS]
+    with results_path.open("a+b") as f:
+        size = f.tell()
+        f.seek(max(size - 1, 0))
+        torn = size > 0 and f.read(1) != b"\n"
+    with results_path.open("a", newline="") as f, \
+            ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        # Header from whether the file is empty: a header-only file has no done rows
+        if size == 0:
+            writer.writeheader()
+        elif torn:
+            f.write("\n")  # finish a row cut short by an interrupted write
+
+        futures = [
+            pool.submit(run_point, i, p, players, rounds, point_seed(seed, i))
+            for i, p in pending
+        ]
+        for future in as_completed(futures):
+            row = future.result()
+            writer.writerow(row)
+            f.flush()
+            yield row
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo sweep over economy parameters")
+    parser.add_argument("results", help="CSV results table, resumed if it exists")
+    parser.add_argument("--samples", type=int, default=256)
+    parser.add_argument("--players", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=52)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    points = random_points(DEFAULT_RANGES, args.samples, args.seed)
+    for row in run_sweep(points, args.results, args.players, args.rounds, args.seed, args.workers):
+        print(f"{row['index']}: gini={row['capital_gini']:.3f} "
+              f"tax={row['mean_tax_rate']:.3f} cohesion={row['social_cohesion']:.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from game_modules import load_module
+
+scoring_system = load_module("scoring-system.py")
+action_store = load_module("action-store.py")
+
+IMPROVEMENT_THRESHOLD = 7  # dimension scores below this become improvement areas
+
+@dataclass
+class RescoreReport:
+    actions: int
+    players: int
+    mean_total_before: float
+    mean_total_after: float
+    max_total_change: float
+    players_rank_changed: int
+    # (player, old rank, new rank), largest moves first
+    biggest_moves: List[Tuple[str, int, int]] = field(default_factory=list)
+    actions_newly_flagged: int = 0   # gained a dimension below the threshold
+    actions_newly_cleared: int = 0   # no longer has one
+    players_crossing_threshold: int = 0
+
+    def format(self) -> str:
+        lines = [
+            f"Actions re-scored: {self.actions} ({self.players} players)",
+            f"Mean total: {self.mean_total_before:.2f} -> {self.mean_total_after:.2f}",
+            f"Largest change in a total: {self.max_total_change:+.2f}",
+            f"Players whose rank changed: {self.players_rank_changed}",
+            f"Improvement threshold (< {IMPROVEMENT_THRESHOLD}): "
+            f"{self.actions_newly_flagged} actions newly flagged, "
+            f"{self.actions_newly_cleared} cleared, "
+            f"{self.players_crossing_threshold} players affected"
+        ]
+        if self.biggest_moves:
+            lines.append("Biggest rank moves:")
+            lines.extend(f"- {p}: #{old} -> #{new}" for p, old, new in self.biggest_moves)
+        return "\n".join(lines)
+
+def _ranks(values: np.ndarray) -> np.ndarray:
+    """1-based rank of each entry, highest value first"""
+    order = np.argsort(-values, kind="stable")
+    ranks = np.empty(len(values), dtype=np.int64)
+    ranks[order] = np.arange(1, len(values) + 1)
+    return ranks
+
+def rescore_history(
+    store: "action_store.ActionStore",
+    scoring: "scoring_system.ScoringSystem",
+    dimension_weights: Optional[Dict[str, float]] = None,
+    bonus_thresholds: Optional[Dict[str, float]] = None,
+    top: int = 20
+) -> RescoreReport:
+    """Recompute every stored action under a new configuration and diff it.
+
+    Each segment is scored in one vectorized pass. Which bonuses were earned
+    (bonus_flags) is kept as recorded; only their point values change.
+    Players are ranked by their mean total before and after.
+    """
+    candidate = scoring_system.ScoringSystem()
+    weights = {**scoring.dimension_weights, **(dimension_weights or {})}
+    candidate.dimension_weights = {d: weights[d] for d in store.dimensions}
+    candidate.bonus_thresholds = {**scoring.bonus_thresholds, **(bonus_thresholds or {})}
+    bonus_keys = scoring.bonus_engine().keys
+    bonus_points = np.array([candidate.bonus_thresholds[k] for k in bonus_keys])
+    bonus_bits = np.arange(len(bonus_keys), dtype=np.uint64)
+
+    player_ids: Dict[bytes, int] = {}
+    sums_before = np.zeros(0)
+    sums_after = np.zeros(0)
+    counts = np.zeros(0)
+    crossed = np.zeros(0, dtype=bool)
+    totals = {"actions": 0, "before": 0.0, "after": 0.0, "flagged": 0, "cleared": 0}
+    max_change = 0.0
+
+    columns = ("player", "achieved", "target", "difficulty", "bonus_flags", "score", "total")
+    for segment in zip(*(store.segments(name) for name in columns)):
+        players, achieved, targets, difficulty, flags, old_scores, old_totals = segment
+
+        earned = ((flags[:, None] >> bonus_bits) & 1).astype(bool)
+        batch = candidate.calculate_scores_batch(achieved, targets, difficulty, earned @ bonus_points)
+
+        change = batch.total_scores - old_totals
+        if len(change):
+            largest = change[np.argmax(np.abs(change))]
+            max_change = largest if abs(largest) > abs(max_change) else max_change
+
+        before = (old_scores < IMPROVEMENT_THRESHOLD).any(axis=1)
+        after = (batch.dimension_scores < IMPROVEMENT_THRESHOLD).any(axis=1)
+        totals["flagged"] += int((after & ~before).sum())
+        totals["cleared"] += int((before & ~after).sum())
+        totals["actions"] += len(old_totals)
+        totals["before"] += float(old_totals.sum())
+        totals["after"] += float(batch.total_scores.sum())
+
+        # Map this segment's players onto global indices, touching only unique ids
+        unique, inverse = np.unique(players, return_inverse=True)
+        mapping = np.array([player_ids.setdefault(p, len(player_ids)) for p in unique.tolist()], dtype=np.int64)
+        index = mapping[inverse]
+        size = len(player_ids)
+        sums_before = np.pad(sums_before, (0, size - len(sums_before)))
+        sums_after = np.pad(sums_after, (0, size - len(sums_after)))
+        counts = np.pad(counts, (0, size - len(counts)))
+        crossed = np.pad(crossed, (0, size - len(crossed)))
+        sums_before += np.bincount(index, old_totals, minlength=size)
+        sums_after += np.bincount(index, batch.total_scores, minlength=size)
+        counts += np.bincount(index, minlength=size)
+        crossed[index[before != after]] = True
+
+    actions = totals["actions"]
+    if actions == 0:
+        return RescoreReport(0, 0, 0.0, 0.0, 0.0, 0)
+
+    old_ranks = _ranks(sums_before / counts)
+    new_ranks = _ranks(sums_after / counts)
+    moves = np.abs(new_ranks - old_ranks)
+    names = [p.decode() for p in player_ids]
+    biggest = np.argsort(-moves, kind="stable")[:top]
+
+    return RescoreReport(
+        actions=actions,
+        players=len(player_ids),
+        mean_total_before=totals["before"] / actions,
+        mean_total_after=totals["after"] / actions,
+        max_total_change=float(max_change),
+        players_rank_changed=int((moves > 0).sum()),
+        biggest_moves=[
+            (names[i], int(old_ranks[i]), int(new_ranks[i]))
+            for i in biggest if moves[i] > 0
+        ],
+        actions_newly_flagged=totals["flagged"],
+        actions_newly_cleared=totals["cleared"],
+        players_crossing_threshold=int(crossed.sum())
+    )
@@ -0,0 +1,93 @@
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, is_dataclass
+from typing import Callable, Dict, Set, Tuple
+import hashlib
+import json
+import time
+
+CacheKey = Tuple[str, str]  # (content fingerprint, question subtype)
+
+def fingerprint(obj) -> str:
+    """Stable hash of a ScoreCard, LazyScoreCard or Scenario's contents"""
+    if hasattr(obj, "materialize"):
+        obj = obj.materialize()
+    fields = asdict(obj) if is_dataclass(obj) else vars(obj)
+    encoded = json.dumps(fields, sort_keys=True, default=repr).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evicted: int = 0
+    invalidated: int = 0
+
+class ResponseCache:
+    """Size-bounded LRU of generated answers with a per-entry TTL.
+
+    Keys pair a content fingerprint with the question subtype, so identical
+    score cards or scenarios share answers. invalidate() drops every entry
+    for a fingerprint once the object it came from is replaced.
+    Cached values are shared; callers must not mutate them.
+    """
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl: float = 600.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[CacheKey, Tuple[float, object]]" = OrderedDict()
+        self._by_fingerprint: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: CacheKey):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= self.clock():
+            self._remove(key)
+            self.stats.expired += 1
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def put(self, key: CacheKey, value):
+        self._entries[key] = (self.clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        self._by_fingerprint.setdefault(key[0], set()).add(key[1])
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.stats.evicted += 1
+
+    def get_or_build(self, fingerprint: str, subtype: str, build: Callable[[], object]):
+        """Cached answer for (fingerprint, subtype), building it on a miss"""
+        key = (fingerprint, subtype)
+        value = self.get(key)
+        if value is None:
+            value = build()
+            self.put(key, value)
+        return value
+
+    def invalidate(self, fingerprint: str):
+        for subtype in self._by_fingerprint.pop(fingerprint, ()):
+            if self._entries.pop((fingerprint, subtype), None) is not None:
+                self.stats.invalidated += 1
+
+    def _remove(self, key: CacheKey):
+        del self._entries[key]
+        subtypes = self._by_fingerprint.get(key[0])
+        if subtypes is not None:
+            subtypes.discard(key[1])
+            if not subtypes:
+                del self._by_fingerprint[key[0]]
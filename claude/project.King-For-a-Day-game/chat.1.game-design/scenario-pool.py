@@ -0,0 +1,126 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterable, Optional, Tuple
+import asyncio
+import logging
+
+from game_modules import load_module
+from seeding import derive_seed
+
+scenario_system = load_module("scenario-system.py")
+
+logger = logging.getLogger(__name__)
+
+DIFFICULTY_LEVELS = (1, 2, 3, 4)
+
+PoolKey = Tuple[str, int]  # (context profile, difficulty)
+
+@dataclass
+class PoolStats:
+    served: int = 0
+    misses: int = 0      # requests that had to generate inline
+    generated: int = 0
+    refills: int = 0
+
+class ScenarioPool:
+    """Warm per-difficulty pools of pre-generated scenarios.
+
+    Each (profile, difficulty) pool is refilled up to its high watermark by a
+    background asyncio task whenever it drops to its low one. `watermarks`
+    maps a difficulty to its own (low, high); other levels use `low`/`high`.
+    Generation runs in the
+    default executor so the event loop keeps serving chats meanwhile.
+    get() is an O(1) pop; an empty or unpooled difficulty falls back to
+    generating inline.
+    """
+    def __init__(
+        self,
+        generator: "scenario_system.ScenarioGenerator",
+        profiles: Dict[str, "scenario_system.Context"],
+        levels: Iterable[int] = DIFFICULTY_LEVELS,
+        low: int = 8,
+        high: int = 32,
+        seed: int = 0,
+        watermarks: Optional[Dict[int, Tuple[int, int]]] = None
+    ):
+        self.watermarks: Dict[int, Tuple[int, int]] = {level: (low, high) for level in levels}
+        self.watermarks.update(watermarks or {})
+        for level, (level_low, level_high) in self.watermarks.items():
+            if not 0 <= level_low < level_high:
+                raise ValueError(f"watermarks for level {level} must satisfy 0 <= low < high")
+        self.generator = generator
+        self.profiles = dict(profiles)
+        self.seed = seed
+        self.stats = PoolStats()
+        self._pools: Dict[PoolKey, Deque] = {
+            (profile, level): deque() for profile in self.profiles for level in self.watermarks
+        }
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return sum(len(pool) for pool in self._pools.values())
+
+    def level(self, difficulty: int, profile: str = "default") -> int:
+        return len(self._pools[(profile, difficulty)])
+
+    def get(self, difficulty: int, profile: str = "default") -> "scenario_system.Scenario":
+        """Next scenario for a difficulty, served from the warm pool when possible"""
+        pool = self._pools.get((profile, difficulty))
+        self.stats.served += 1
+        if pool is not None and len(pool) <= self.watermarks[difficulty][0] and self._wakeup is not None:
+            self._wakeup.set()
+        if pool:
+            return pool.popleft()
+        self.stats.misses += 1
+        return self.generator.generate_scenario(self.profiles[profile], difficulty)
+
+    def _generate(self, key: PoolKey, count: int, seed: int):
+        profile, difficulty = key
+        return self.generator.generate_scenarios(
+            [self.profiles[profile]] * count,
+            [difficulty] * count,
+            seed=seed
+        )
+
+    async def fill(self):
+        """Top up every pool below its low watermark to the high watermark"""
+        loop = asyncio.get_running_loop()
+        for key, pool in self._pools.items():
+            low, high = self.watermarks[key[1]]
+            if len(pool) > low:
+                continue
+            count = high - len(pool)
+            # Each refill draws from its own stream, so pool contents are reproducible
+            seed = derive_seed(self.seed, self.stats.refills)
+            self.stats.refills += 1
+            scenarios = await loop.run_in_executor(None, self._generate, key, count, seed)
+            pool.extend(scenarios[:high - len(pool)])
+            self.stats.generated += len(scenarios)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.fill()
+            except Exception:
+                # get() keeps working by generating inline; retry on the next wakeup
+                logger.exception("scenario pool refill failed")
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+    def start(self) -> asyncio.Task:
+        """Start the background producer on the running loop"""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return self._task
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._wakeup = None
@@ -1,7 +1,17 @@
-from dataclasses import dataclass
-from typing import List, Dict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from string import Template
+from typing import Iterable, Iterator, List, Dict, Optional, Sequence, Tuple
+import math
+import os
 import random
 
+import numpy as np
+
+ETHICAL_DIMENSIONS = ("openness", "respect", "accountability", "practice", "validation", "outcomes")
+
 @dataclass
 class Stakeholder:
     name: str
@@ -9,6 +19,199 @@ class Stakeholder:
     interests: List[str]
     communication_style: str
 
+class AliasTable:
+    """Vose alias table: O(n) build, O(1) weighted draw"""
+    __slots__ = ("probability", "alias")
+
+    def __init__(self, weights: Sequence[float]):
+        count = len(weights)
+        total = float(sum(weights))
+        if count == 0 or total <= 0:
+            raise ValueError("AliasTable needs at least one positive weight")
+        scaled = [w * count / total for w in weights]
+        self.probability = [1.0] * count
+        self.alias = list(range(count))
+        small = [i for i, w in enumerate(scaled) if w < 1.0]
+        large = [i for i, w in enumerate(scaled) if w >= 1.0]
+        while small and large:
+            low, high = small.pop(), large.pop()
+            self.probability[low] = scaled[low]
+            self.alias[low] = high
+            scaled[high] += scaled[low] - 1.0
+            (small if scaled[high] < 1.0 else large).append(high)
+
+    def __len__(self) -> int:
+        return len(self.probability)
+
+    def draw(self, rng) -> int:
+        """One weighted index; `rng` is anything with a random() method"""
+        u = rng.random() * len(self.probability)
+        i = min(int(u), len(self.probability) - 1)
+        return i if u - i < self.probability[i] else self.alias[i]
+
+@dataclass(slots=True)
+class SocialEdge:
+    relationships: Dict[str, int] = field(default_factory=dict)  # type -> times reported
+    interactions: int = 0
+    last_seen: float = 0.0
+
+    @property
+    def relationship(self) -> str:
+        """The relationship type reported most often"""
+        return max(self.relationships, key=self.relationships.get, default="")
+
+@dataclass
+class Interaction:
+    """One validated record of a social export"""
+    contact: str
+    timestamp: float = 0.0
+    count: int = 1
+    relationship: str = ""
+    interests: List[str] = field(default_factory=list)
+    communication_style: str = ""
+    participants: List[str] = field(default_factory=list)
+
+def _coerce_timestamp(value) -> float:
+    """Seconds since the epoch from a number or an ISO 8601 string"""
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError:
+            moment = datetime.fromisoformat(value)
+            if moment.tzinfo is None:
+                moment = moment.replace(tzinfo=timezone.utc)
+            return moment.timestamp()
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError(f"bad timestamp: {value!r}")
+    return float(value)
+
+def _string_list(value, name: str) -> List[str]:
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f"{name} must be a list of strings")
+    return value
+
+def parse_interaction(record) -> Interaction:
+    """Validate and coerce one raw export record, raising ValueError when unusable"""
+    if not isinstance(record, dict):
+        raise ValueError("record must be an object")
+    contact = record.get("contact")
+    if not isinstance(contact, str) or not contact:
+        raise ValueError(f"bad contact: {contact!r}")
+    count = record.get("count", 1)
+    if isinstance(count, bool) or not isinstance(count, int) or count < 1:
+        raise ValueError(f"bad count: {count!r}")
+    relationship = record.get("relationship") or ""
+    style = record.get("communication_style") or ""
+    if not isinstance(relationship, str) or not isinstance(style, str):
+        raise ValueError("relationship and communication_style must be strings")
+    return Interaction(
+        contact=contact,
+        timestamp=_coerce_timestamp(record.get("timestamp", 0.0)),
+        count=count,
+        relationship=relationship,
+        interests=_string_list(record.get("interests", []), "interests"),
+        communication_style=style,
+        participants=_string_list(record.get("participants", []), "participants")
+    )
+
+def interaction_edges(interaction: Interaction, owner: str) -> Iterator[Tuple[str, str, str, float, int]]:
+    """(source, target, relationship, timestamp, count) for every edge a record adds"""
+    yield owner, interaction.contact, interaction.relationship, interaction.timestamp, interaction.count
+    # Other people in the same conversation know each other too
+    for other in interaction.participants:
+        if other != interaction.contact and other != owner:
+            yield interaction.contact, other, "", interaction.timestamp, 1
+
+class SocialGraph:
+    """Index of who a player interacts with, how often and how recently.
+
+    Edges are undirected and carry an interaction count, a relationship type
+    and the last time the pair interacted. Stakeholders are sampled in
+    proportion to count * 2 ** (last_seen / half_life), through an alias table
+    per node that is rebuilt only after that node's edges change.
+    """
+    def __init__(self, owner: str, half_life: float = 30 * 24 * 3600):
+        self.owner = owner
+        self.half_life = half_life
+        self.profiles: Dict[str, Stakeholder] = {}
+        self._adjacency: Dict[str, Dict[str, SocialEdge]] = {}
+        self._samplers: Dict[str, Tuple[List[str], List[float], AliasTable]] = {}
+
+    def __len__(self) -> int:
+        return len(self._adjacency.get(self.owner, {}))
+
+    def add_profile(self, stakeholder: Stakeholder):
+        self.profiles[stakeholder.name] = stakeholder
+
+    def record_interaction(
+        self,
+        source: str,
+        target: str,
+        relationship: str,
+        timestamp: float,
+        count: int = 1
+    ):
+        """Add `count` interactions between two people, reporting one relationship type"""
+        for a, b in ((source, target), (target, source)):
+            edges = self._adjacency.setdefault(a, {})
+            edge = edges.get(b)
+            if edge is None:
+                edge = edges[b] = SocialEdge()
+            edge.interactions += count
+            edge.last_seen = max(edge.last_seen, timestamp)
+            if relationship:
+                edge.relationships[relationship] = edge.relationships.get(relationship, 0) + 1
+            self._samplers.pop(a, None)
+
+    def neighbors(self, node: Optional[str] = None) -> Dict[str, SocialEdge]:
+        return self._adjacency.get(self.owner if node is None else node, {})
+
+    def stakeholder(self, name: str, node: Optional[str] = None) -> Stakeholder:
+        """Profile for a contact, or a minimal one built from the edge"""
+        profile = self.profiles.get(name)
+        if profile is not None:
+            return profile
+        return Stakeholder(name, self.neighbors(node)[name].relationship, [], "unknown")
+
+    def _sampler(self, node: str) -> Tuple[List[str], List[float], AliasTable]:
+        sampler = self._samplers.get(node)
+        if sampler is None:
+            edges = self.neighbors(node)
+            names = list(edges)
+            # Recency decay relative to the node's newest edge; the common factor cancels out.
+            # The exponent is floored so very old contacts keep a tiny nonzero weight.
+            newest = max((e.last_seen for e in edges.values()), default=0.0)
+            weights = [
+                edges[n].interactions * math.pow(2.0, max((edges[n].last_seen - newest) / self.half_life, -1000.0))
+                for n in names
+            ]
+            sampler = self._samplers[node] = (names, weights, AliasTable(weights))
+        return sampler
+
+    def sample_stakeholders(
+        self,
+        count: int,
+        rng=random,
+        node: Optional[str] = None
+    ) -> List[Stakeholder]:
+        """`count` distinct contacts, weighted by interaction frequency and recency"""
+        node = self.owner if node is None else node
+        names, weights, table = self._sampler(node)
+        if count > len(names):
+            raise ValueError("Sample larger than population")
+        chosen: Dict[int, None] = {}
+        attempts = 0
+        # Rejection keeps each draw O(1) while count is small relative to the circle
+        while len(chosen) < count and attempts < 8 * count:
+            chosen.setdefault(table.draw(rng))
+            attempts += 1
+        if len(chosen) < count:
+            remaining = [i for i in range(len(names)) if i not in chosen]
+            rest = AliasTable([weights[i] for i in remaining])
+            while len(chosen) < count:
+                chosen.setdefault(remaining[rest.draw(rng)])
+        return [self.stakeholder(names[i], node) for i in chosen]
+
 @dataclass
 class Context:
     location: str
@@ -16,6 +219,7 @@ class Context:
     social_circle: List[Stakeholder]
     recent_events: List[str]
     constraints: List[str]
+    social_graph: Optional[SocialGraph] = None
 
 @dataclass
 class Scenario:
@@ -27,22 +231,170 @@ class Scenario:
     difficulty: int
     ethical_dimensions: Dict[str, float]
 
+# Raw templates per scenario type. $timeframe and $pressure are resolved when a
+# template is compiled; $stakeholders and $event are filled per scenario.
+SCENARIO_TEMPLATES = {
+    "Resource allocation conflict": {
+        "description": "$stakeholders all need the same limited resources over the coming $timeframe. "
+                       "It came to a head after $event. $pressure",
+        "options": [
+            "Split the resources evenly",
+            "Prioritize whoever has the most urgent need",
+            "Set up a rotating schedule",
+            "Pool resources and decide together",
+            "Look for additional resources outside the group"
+        ],
+        "implications": [
+            "How you split things now sets expectations for the next $timeframe",
+            "Anyone who feels shortchanged may withdraw their cooperation",
+            "A fair process can become a template the community reuses"
+        ]
+    },
+    "Communication breakdown": {
+        "description": "$stakeholders have stopped talking to each other since $event, "
+                       "and the silence could last $timeframe. $pressure",
+        "options": [
+            "Talk to each person privately first",
+            "Bring everyone together for an open conversation",
+            "Ask a neutral person to mediate",
+            "Put agreements in writing",
+            "Give everyone time before stepping in"
+        ],
+        "implications": [
+            "Unresolved misunderstandings tend to harden over $timeframe",
+            "Whoever restarts the conversation gains trust or resentment",
+            "A shared channel could prevent the next breakdown"
+        ]
+    },
+    "Trust violation": {
+        "description": "After $event, $stakeholders feel someone broke their trust, "
+                       "and rebuilding it may take $timeframe. $pressure",
+        "options": [
+            "Address the violation openly",
+            "Hear each side before judging",
+            "Agree on concrete steps to make amends",
+            "Set clearer boundaries going forward",
+            "Involve someone everyone respects"
+        ],
+        "implications": [
+            "Trust rebuilt over $timeframe is often stronger than before",
+            "Ignoring the violation signals that it is acceptable",
+            "How consequences are handled shapes future honesty"
+        ]
+    },
+    "Innovation vs tradition": {
+        "description": "$stakeholders disagree about changing how things have always been done, "
+                       "especially after $event. The outcome will matter for $timeframe. $pressure",
+        "options": [
+            "Try the new approach on a small scale",
+            "Keep the tradition and revisit later",
+            "Blend the old and new approaches",
+            "Let the people most affected decide",
+            "Document what the tradition protects before changing it"
+        ],
+        "implications": [
+            "Change adopted too fast can alienate people for $timeframe",
+            "Refusing change can push newer members away",
+            "A successful pilot can turn skeptics into supporters"
+        ]
+    },
+    "Individual vs group needs": {
+        "description": "Since $event, what one person needs conflicts with what $stakeholders "
+                       "need as a group, and it will affect the next $timeframe. $pressure",
+        "options": [
+            "Accommodate the individual need",
+            "Put the group's needs first",
+            "Find a partial accommodation for both",
+            "Ask the group to vote",
+            "Set a time limit and reassess"
+        ],
+        "implications": [
+            "Precedents set now will be cited for $timeframe",
+            "Neglecting individuals erodes belonging",
+            "Neglecting the group erodes shared commitment"
+        ]
+    }
+}
+
+BASE_SCENARIOS = tuple(SCENARIO_TEMPLATES)
+
+PRESSURE_LINES = [
+    (0.3, "The situation is still manageable."),
+    (0.5, "Tension is rising and people expect you to act."),
+    (0.7, "Several relationships are at stake and there is no obvious right answer."),
+    (1.0, "Every choice carries a real cost and someone will be disappointed.")
+]
+
+@dataclass(frozen=True)
+class CompiledScenarioTemplate:
+    """Scenario text resolved for one scenario type and difficulty"""
+    description: Template
+    options: Tuple[str, ...]
+    implications: Tuple[str, ...]
+
+    def fill(self, stakeholders: List[Stakeholder], recent_events: List[str]) -> str:
+        names = [f"{s.name} ({s.relationship})" for s in stakeholders]
+        if not names:
+            joined = "People around you"
+        elif len(names) == 1:
+            joined = names[0]
+        else:
+            joined = ", ".join(names[:-1]) + " and " + names[-1]
+        event = recent_events[0] if recent_events else "a recent disagreement"
+        return self.description.substitute(stakeholders=joined, event=event)
+
 class ScenarioGenerator:
-    def __init__(self):
+    def __init__(self, template_cache_size: int = 256):
         self.difficulty_modifiers = {
             1: {"stakeholders": 2, "timeframe": "days", "complexity": 0.3},
             2: {"stakeholders": 3, "timeframe": "weeks", "complexity": 0.5},
             3: {"stakeholders": 4, "timeframe": "months", "complexity": 0.7},
             4: {"stakeholders": 5, "timeframe": "years", "complexity": 1.0}
         }
+        # Bounded LRU of compiled templates, keyed on the fields that shape the text
+        self.compile_template = lru_cache(maxsize=template_cache_size)(self._compile_template)
 
-    def analyze_social_data(self, social_data):
-        """Extract patterns and relationships from social media data"""
-        # Analyze communication patterns
+    def _compile_template(self, scenario_type: str, timeframe: str, complexity: float) -> CompiledScenarioTemplate:
+        """Parse and resolve a scenario template once per type and difficulty"""
+        raw = SCENARIO_TEMPLATES[scenario_type]
+        pressure = next(line for limit, line in PRESSURE_LINES if complexity <= limit)
+        description = Template(raw["description"]).safe_substitute(timeframe=timeframe, pressure=pressure)
+        option_count = 2 + round(complexity * (len(raw["options"]) - 2))
+        return CompiledScenarioTemplate(
+            description=Template(description),
+            options=tuple(raw["options"][:option_count]),
+            implications=tuple(Template(line).substitute(timeframe=timeframe) for line in raw["implications"])
+        )
+
+    def _template_for(self, scenario_type: str, difficulty: int) -> CompiledScenarioTemplate:
+        modifiers = self.difficulty_modifiers[difficulty]
+        return self.compile_template(scenario_type, modifiers["timeframe"], modifiers["complexity"])
+
+    def analyze_social_data(self, social_data: Iterable[Dict], owner: str = "player") -> SocialGraph:
+        """Extract patterns and relationships from social media data.
+
+        Records are validated with parse_interaction and folded in the same
+        way social-ingest folds a streamed export: each relationship is the
+        type reported most often, each profile keeps the latest details.
+        """
+        graph = SocialGraph(owner)
+        details: Dict[str, Tuple[List[str], str]] = {}
+        for record in social_data:
+            interaction = parse_interaction(record)
+            # Analyze communication patterns and map who talks to whom
+            for edge in interaction_edges(interaction, owner):
+                graph.record_interaction(*edge)
+            if interaction.interests or interaction.communication_style:
+                interests, style = details.get(interaction.contact, ([], ""))
+                details[interaction.contact] = (
+                    interaction.interests[:10] or interests,
+                    interaction.communication_style or style
+                )
         # Identify key relationships
-        # Map frequent interaction types
+        for contact, (interests, style) in details.items():
+            graph.add_profile(Stakeholder(contact, graph.neighbors()[contact].relationship, list(interests), style or "unknown"))
         # Return structured social context
-        pass
+        return graph
 
     def generate_ethical_dimensions(self, difficulty):
         """Generate weighted ethical considerations"""
@@ -60,49 +412,148 @@ class ScenarioGenerator:
         modifiers = self.difficulty_modifiers[difficulty]
         
         # Select relevant stakeholders
-        scenario_stakeholders = random.sample(
-            player_context.social_circle, 
-            modifiers["stakeholders"]
-        )
+        if player_context.social_graph is not None:
+            scenario_stakeholders = player_context.social_graph.sample_stakeholders(
+                modifiers["stakeholders"]
+            )
+        else:
+            scenario_stakeholders = random.sample(
+                player_context.social_circle, 
+                modifiers["stakeholders"]
+            )
 
         # Generate scenario description
-        base_scenarios = [
-            "Resource allocation conflict",
-            "Communication breakdown",
-            "Trust violation",
-            "Innovation vs tradition",
-            "Individual vs group needs"
-        ]
-        
-        scenario_type = random.choice(base_scenarios)
+        scenario_type = random.choice(BASE_SCENARIOS)
         
-        # Generate specific details based on context
-        description = self.contextualize_scenario(
-            scenario_type,
-            scenario_stakeholders,
-            player_context.recent_events,
-            modifiers
-        )
+        # Only the stakeholder and recent-event slots are filled per call
+        template = self._template_for(scenario_type, difficulty)
+        description = template.fill(scenario_stakeholders, player_context.recent_events)
 
         return Scenario(
             title=f"Level {difficulty}: {scenario_type}",
             description=description,
             stakeholders=scenario_stakeholders,
-            immediate_options=self.generate_options(scenario_type, difficulty),
-            long_term_implications=self.generate_implications(scenario_type, difficulty),
+            immediate_options=list(template.options),
+            long_term_implications=list(template.implications),
             difficulty=difficulty,
             ethical_dimensions=self.generate_ethical_dimensions(difficulty)
         )
 
+    def generate_scenarios(
+        self,
+        contexts: Sequence[Context],
+        difficulties: Sequence[int],
+        seed: int = 0,
+        workers: Optional[int] = 1,
+        chunk_size: int = 10_000
+    ) -> List[Scenario]:
+        """Generate one scenario per (context, difficulty) pair, reproducibly.
+
+        The batch is cut into chunks, each with its own stream spawned from
+        `seed`, so the result depends only on the seed and chunk size, not on
+        how many workers run it. Pass workers=None to use every CPU.
+        """
+        if len(contexts) != len(difficulties):
+            raise ValueError("contexts and difficulties must have the same length")
+        starts = range(0, len(contexts), chunk_size)
+        chunks = [
+            (contexts[start:start + chunk_size], difficulties[start:start + chunk_size],
+             np.random.SeedSequence(seed, spawn_key=(i,)))
+            for i, start in enumerate(starts)
+        ]
+        if workers == 1 or len(chunks) <= 1:
+            results = [
+                self._generate_batch(c, d, np.random.default_rng(s)) for c, d, s in chunks
+            ]
+        else:
+            cache_size = self.compile_template.cache_parameters()["maxsize"]
+            with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+                results = list(pool.map(
+                    _generate_chunk,
+                    *zip(*chunks),
+                    [cache_size] * len(chunks)
+                ))
+        return [scenario for chunk in results for scenario in chunk]
+
+    def _generate_batch(
+        self,
+        contexts: Sequence[Context],
+        difficulties: Sequence[int],
+        rng: np.random.Generator
+    ) -> List[Scenario]:
+        """Draw every random choice for a chunk up front, then fill templates"""
+        count = len(contexts)
+        levels = np.asarray(difficulties, dtype=np.int64)
+        dimensions = rng.uniform(0.3, 1.0, (count, len(ETHICAL_DIMENSIONS))) * levels[:, None]
+        types = rng.integers(0, len(BASE_SCENARIOS), count)
+
+        # Stakeholders: a few distinct indices per row, drawn by rejection
+        needed = np.array([self.difficulty_modifiers[d]["stakeholders"] for d in levels.tolist()], dtype=np.int64)
+        sizes = np.array([
+            len(c.social_circle) if c.social_graph is None else n
+            for c, n in zip(contexts, needed.tolist())
+        ], dtype=np.int64)
+        if count and (sizes < needed).any():
+            raise ValueError("Sample larger than population")
+        picks = _sample_distinct(sizes, needed, rng)
+
+        scenarios = []
+        for i, context in enumerate(contexts):
+            difficulty = int(levels[i])
+            scenario_type = BASE_SCENARIOS[types[i]]
+            if context.social_graph is not None:
+                stakeholders = context.social_graph.sample_stakeholders(int(needed[i]), rng)
+            else:
+                stakeholders = [context.social_circle[j] for j in picks[i, :needed[i]].tolist()]
+            template = self._template_for(scenario_type, difficulty)
+            scenarios.append(Scenario(
+                title=f"Level {difficulty}: {scenario_type}",
+                description=template.fill(stakeholders, context.recent_events),
+                stakeholders=stakeholders,
+                immediate_options=list(template.options),
+                long_term_implications=list(template.implications),
+                difficulty=difficulty,
+                ethical_dimensions=dict(zip(ETHICAL_DIMENSIONS, dimensions[i].tolist()))
+            ))
+        return scenarios
+
     def contextualize_scenario(self, scenario_type, stakeholders, recent_events, modifiers):
         """Create detailed scenario description using context"""
         # Template-based generation with contextual filling
-        pass
+        template = self.compile_template(scenario_type, modifiers["timeframe"], modifiers["complexity"])
+        return template.fill(stakeholders, recent_events)
 
     def generate_options(self, scenario_type, difficulty):
         """Generate possible immediate actions"""
-        pass
+        return list(self._template_for(scenario_type, difficulty).options)
 
     def generate_implications(self, scenario_type, difficulty):
         """Generate long-term consequences"""
-        pass
+        return list(self._template_for(scenario_type, difficulty).implications)
+
+def _sample_distinct(sizes: np.ndarray, needed: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Row i gets needed[i] distinct indices below sizes[i], in random order.
+
+    Each position is drawn for every row at once and only rows that hit an
+    earlier pick redraw, so the cost is O(needed) per row however large the
+    circles are. Slots past needed[i] are left as -1.
+    """
+    width = int(needed.max()) if len(needed) else 0
+    picks = np.full((len(needed), width), -1, dtype=np.int64)
+    for j in range(width):
+        rows = np.flatnonzero(needed > j)
+        while len(rows):
+            draws = rng.integers(0, sizes[rows])
+            picks[rows, j] = draws
+            rows = rows[(picks[rows, :j] == draws[:, None]).any(axis=1)]
+    return picks
+
+def _generate_chunk(
+    contexts: Sequence[Context],
+    difficulties: Sequence[int],
+    seed: np.random.SeedSequence,
+    template_cache_size: int
+) -> List[Scenario]:
+    """Process-pool entry point for ScenarioGenerator.generate_scenarios"""
+    generator = ScenarioGenerator(template_cache_size)
+    return generator._generate_batch(contexts, difficulties, np.random.default_rng(seed))
@@ -1,6 +1,10 @@
-from dataclasses import dataclass
-from typing import Dict, List
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
 import math
+import operator
+
+import numpy as np
 
 @dataclass
 class PlayerAction:
@@ -9,6 +13,15 @@ class PlayerAction:
     ethical_metrics: Dict[str, float]
     timestamp: float
 
+def action_key(action: PlayerAction) -> Tuple:
+    """Identity of an action for history bookkeeping"""
+    return (
+        action.timestamp,
+        action.description,
+        tuple(action.ethical_metrics.items()),
+        tuple(action.stakeholder_impacts.items())
+    )
+
 @dataclass
 class ScoreCard:
     total_score: float
@@ -17,6 +30,293 @@ class ScoreCard:
     bonus_points: float
     difficulty_multiplier: float
     detailed_breakdown: Dict[str, Dict[str, float]]
+    bonus_flags: int = 0  # bit i set when BONUS_KEYS[i] was earned
+
+@dataclass(frozen=True)
+class BonusRule:
+    """Declarative bonus, earned when every (feature, op, threshold) condition holds.
+
+    A string threshold names an entry of ScoringSystem.bonus_criteria; the
+    points come from bonus_thresholds[key].
+    """
+    key: str
+    conditions: Tuple[Tuple[str, str, Union[float, str]], ...]
+
+DEFAULT_BONUS_RULES = (
+    BonusRule("consistent_improvement", (("streak", ">=", "improvement_streak"),)),
+    BonusRule("stakeholder_satisfaction", (
+        ("min_impact", ">=", 0.0),
+        ("mean_impact", ">=", "stakeholder_satisfaction")
+    )),
+    BonusRule("creative_solution", (("peak_gap", ">=", "creative_margin"),)),
+    BonusRule("community_impact", (("total_impact", ">=", "community_impact"),))
+)
+
+# Bonus bit order used by ScoreCard.bonus_flags and stored score history
+BONUS_KEYS = tuple(rule.key for rule in DEFAULT_BONUS_RULES)
+
+_COMPARISONS = {
+    ">=": (operator.ge, np.greater_equal),
+    ">": (operator.gt, np.greater),
+    "<=": (operator.le, np.less_equal),
+    "<": (operator.lt, np.less),
+    "==": (operator.eq, np.equal)
+}
+
+# Bonus flags are stored as uint64 bitmasks
+MAX_BONUS_RULES = 64
+
+class BonusRuleEngine:
+    """Bonus rules compiled into vectorized condition groups.
+
+    A batch is evaluated with one NumPy comparison per operator and one
+    matrix product, however many rules there are.
+    """
+    def __init__(self, rules: Sequence[BonusRule], criteria: Dict[str, float]):
+        if len(rules) > MAX_BONUS_RULES:
+            raise ValueError(f"at most {MAX_BONUS_RULES} bonus rules fit in the flag bitmask")
+        self.keys = tuple(rule.key for rule in rules)
+        conditions = [
+            (feature, op, criteria[threshold] if isinstance(threshold, str) else threshold, rule_index)
+            for rule_index, rule in enumerate(rules)
+            for feature, op, threshold in rule.conditions
+        ]
+        self.features = tuple(sorted({feature for feature, _, _, _ in conditions}))
+        feature_index = {feature: i for i, feature in enumerate(self.features)}
+
+        self._groups = []
+        for op in sorted({op for _, op, _, _ in conditions}):
+            members = [i for i, c in enumerate(conditions) if c[1] == op]
+            self._groups.append((
+                _COMPARISONS[op][1],
+                np.array([feature_index[conditions[i][0]] for i in members]),
+                np.array([conditions[i][2] for i in members], dtype=float),
+                np.array(members)
+            ))
+
+        # Condition -> rule membership; a rule holds when all its conditions do
+        self._membership = np.zeros((len(conditions), len(rules)), dtype=np.int32)
+        for i, (_, _, _, rule_index) in enumerate(conditions):
+            self._membership[i, rule_index] = 1
+        self._required = self._membership.sum(axis=0)
+        self._bit_values = np.left_shift(np.uint64(1), np.arange(len(rules), dtype=np.uint64))
+
+        self._scalar_rules = [
+            [(feature, _COMPARISONS[op][0], threshold) for feature, op, threshold, r in conditions if r == rule_index]
+            for rule_index in range(len(rules))
+        ]
+
+    def evaluate(self, features: Dict[str, np.ndarray]) -> np.ndarray:
+        """(actions x rules) boolean matrix of earned bonuses"""
+        columns = np.column_stack([np.asarray(features[f], dtype=float) for f in self.features])
+        satisfied = np.empty((len(columns), len(self._membership)), dtype=np.int32)
+        for compare, feature_columns, thresholds, members in self._groups:
+            satisfied[:, members] = compare(columns[:, feature_columns], thresholds)
+        return satisfied @ self._membership == self._required
+
+    def flags(self, earned: np.ndarray) -> np.ndarray:
+        """Bitmask per action from an evaluate() result"""
+        return earned @ self._bit_values
+
+    def flags_one(self, features: Dict[str, float]) -> int:
+        """Bitmask for a single action's features"""
+        flags = 0
+        for bit, conditions in enumerate(self._scalar_rules):
+            if all(compare(features[f], threshold) for f, compare, threshold in conditions):
+                flags |= 1 << bit
+        return flags
+
+IMPROVEMENT_SUGGESTIONS = {
+    "openness": "Consider being more transparent about your decision-making process",
+    "respect": "Try to acknowledge and address all stakeholders' perspectives",
+    "accountability": "Develop clearer ways to measure and track outcomes",
+    "practice": "Focus on making solutions more practically implementable",
+    "validation": "Create better ways for others to verify your approach",
+    "outcomes": "Consider longer-term implications of your decisions"
+}
+DEFAULT_SUGGESTION = "Focus on improving this area"
+
+# Explanation templates, compiled once into bound format methods
+_TOTAL_LINE = "Total Score: {:.2f}".format
+_DIMENSION_LINE = "- {}: {:.2f}/10".format
+_BONUS_LINE = "\nBonus Points: +{}".format
+_IMPROVEMENT_LINE = "- {}".format
+_BREAKDOWN_HEADER = "\nBreakdown by dimension:"
+_IMPROVEMENT_HEADER = "\nAreas for improvement:"
+
+class LazyScoreCard:
+    """ScoreCard whose breakdown, improvement areas and explanation are built on first access"""
+    def __init__(
+        self,
+        scoring: "ScoringSystem",
+        total_score: float,
+        dimension_scores: Dict[str, float],
+        bonus_points: float,
+        difficulty_multiplier: float,
+        achieved: Dict[str, float],
+        targets: Dict[str, float],
+        bonus_flags: int = 0
+    ):
+        self.total_score = total_score
+        self.dimension_scores = dimension_scores
+        self.bonus_points = bonus_points
+        self.difficulty_multiplier = difficulty_multiplier
+        self.bonus_flags = bonus_flags
+        self._scoring = scoring
+        self._achieved = achieved
+        self._targets = targets
+
+    @cached_property
+    def improvement_areas(self) -> List[str]:
+        return self._scoring._identify_improvement_areas(self.dimension_scores)
+
+    @cached_property
+    def detailed_breakdown(self) -> Dict[str, Dict[str, float]]:
+        return self._scoring._build_breakdown(self.dimension_scores, self._achieved, self._targets)
+
+    @cached_property
+    def explanation(self) -> str:
+        return self._scoring._render_explanation(self)
+
+    def materialize(self) -> ScoreCard:
+        """Plain ScoreCard with every field computed"""
+        return ScoreCard(
+            total_score=self.total_score,
+            dimension_scores=self.dimension_scores,
+            improvement_areas=self.improvement_areas,
+            bonus_points=self.bonus_points,
+            difficulty_multiplier=self.difficulty_multiplier,
+            detailed_breakdown=self.detailed_breakdown,
+            bonus_flags=self.bonus_flags
+        )
+
+class PlayerHistory:
+    """Bounded rolling statistics for one player's recent dimension scores"""
+    __slots__ = (
+        "_ring", "_keys", "_cursor", "_column_sums", "count",
+        "streak", "last_mean", "ewma_score", "ewma_trend", "peak_gap"
+    )
+
+    def __init__(self, window: int, dimensions: int):
+        self._ring = [[0.0] * dimensions for _ in range(window)]
+        self._keys: List[Optional[Tuple]] = [None] * window  # action behind each ring slot
+        self._cursor = 0
+        self._column_sums = [0.0] * dimensions
+        self.count = 0
+        self.streak = 0          # consecutive actions beating the previous mean score
+        self.last_mean = 0.0
+        self.ewma_score = 0.0
+        self.ewma_trend = 0.0
+        self.peak_gap = 0.0      # largest lead of this action over the recent dimension means
+
+    def recent_means(self) -> List[float]:
+        filled = min(self.count, len(self._ring))
+        return [total / filled for total in self._column_sums] if filled else list(self._column_sums)
+
+    def observe(self, scores: List[float], alpha: float, key: Optional[Tuple] = None) -> bool:
+        """Fold one action's dimension scores in, evicting the oldest past the window.
+
+        An action whose key is still in the window was already counted, so
+        scoring it again leaves the history untouched; returns whether it was folded in.
+        """
+        if key is not None and key in self._keys:
+            return False
+        self.peak_gap = max(
+            (score - mean for score, mean in zip(scores, self.recent_means())),
+            default=0.0
+        ) if self.count else 0.0
+
+        evicted = self._ring[self._cursor]
+        for i, score in enumerate(scores):
+            self._column_sums[i] += score - (evicted[i] if self.count >= len(self._ring) else 0.0)
+            evicted[i] = score
+        self._keys[self._cursor] = key
+        self._cursor = (self._cursor + 1) % len(self._ring)
+
+        mean = sum(scores) / len(scores)
+        if self.count:
+            self.streak = self.streak + 1 if mean > self.last_mean else 0
+            previous = self.ewma_score
+            self.ewma_score += alpha * (mean - self.ewma_score)
+            self.ewma_trend += alpha * ((self.ewma_score - previous) - self.ewma_trend)
+        else:
+            self.ewma_score = mean
+        self.last_mean = mean
+        self.count += 1
+        return True
+
+class PlayerHistoryStore:
+    """Per-player rolling statistics with a fixed memory footprint per player"""
+    def __init__(self, window: int = 8, alpha: float = 0.3):
+        self.window = window
+        self.alpha = alpha
+        self._players: Dict[str, PlayerHistory] = {}
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    def get(self, player_id: Optional[str]) -> Optional[PlayerHistory]:
+        return self._players.get(player_id)
+
+    def observe(
+        self,
+        player_id: Optional[str],
+        dimension_scores: Dict[str, float],
+        key: Optional[Tuple] = None
+    ) -> Optional[PlayerHistory]:
+        """Record an action's dimension scores once per action key; anonymous actions are not tracked"""
+        if player_id is None:
+            return None
+        history = self._players.get(player_id)
+        if history is None:
+            history = self._players[player_id] = PlayerHistory(self.window, len(dimension_scores))
+        history.observe(list(dimension_scores.values()), self.alpha, key)
+        return history
+
+@dataclass
+class ScoreBatch:
+    """Columnar scores for a batch of actions, one row per action"""
+    dimensions: Tuple[str, ...]
+    achieved: np.ndarray                # (A, D)
+    targets: np.ndarray                 # (A, D)
+    dimension_scores: np.ndarray        # (A, D)
+    difficulty_multipliers: np.ndarray  # (A,)
+    bonus_points: np.ndarray            # (A,) in the bonus_thresholds' own number type
+    total_scores: np.ndarray            # (A,)
+    scoring: "ScoringSystem" = field(repr=False, default=None)
+    bonus_flags: Optional[np.ndarray] = None  # (A,) when bonuses were evaluated
+
+    def __len__(self) -> int:
+        return len(self.total_scores)
+
+    def scorecard(self, index: int, lazy: bool = False) -> ScoreCard:
+        """Materialize the ScoreCard for one action on demand"""
+        dimension_scores = dict(zip(self.dimensions, self.dimension_scores[index].tolist()))
+        achieved = dict(zip(self.dimensions, self.achieved[index].tolist()))
+        targets = dict(zip(self.dimensions, self.targets[index].tolist()))
+        if lazy:
+            return LazyScoreCard(
+                self.scoring,
+                total_score=float(self.total_scores[index]),
+                dimension_scores=dimension_scores,
+                bonus_points=self.bonus_points[index].item(),
+                difficulty_multiplier=float(self.difficulty_multipliers[index]),
+                achieved=achieved,
+                targets=targets,
+                bonus_flags=self._flags(index)
+            )
+        return ScoreCard(
+            total_score=float(self.total_scores[index]),
+            dimension_scores=dimension_scores,
+            improvement_areas=self.scoring._identify_improvement_areas(dimension_scores),
+            bonus_points=self.bonus_points[index].item(),
+            difficulty_multiplier=float(self.difficulty_multipliers[index]),
+            detailed_breakdown=self.scoring._build_breakdown(dimension_scores, achieved, targets),
+            bonus_flags=self._flags(index)
+        )
+
+    def _flags(self, index: int) -> int:
+        return 0 if self.bonus_flags is None else int(self.bonus_flags[index])
 
 class ScoringSystem:
     def __init__(self):
@@ -36,13 +336,49 @@ class ScoringSystem:
             "community_impact": 5
         }
 
-    def calculate_score(self, player_action: PlayerAction, scenario_context: Dict) -> ScoreCard:
-        """Calculate comprehensive score for a player's action"""
+        # What each bonus check requires
+        self.bonus_criteria = {
+            "improvement_streak": 3,          # actions in a row beating the previous one
+            "stakeholder_satisfaction": 0.5,  # mean impact, with nobody harmed
+            "creative_margin": 3.0,           # points above the player's recent dimension mean
+            "community_impact": 2.0           # total impact across stakeholders
+        }
+
+        self.bonus_rules: List[BonusRule] = list(DEFAULT_BONUS_RULES)
+        self._compiled_rules: Optional[Tuple[Tuple, BonusRuleEngine]] = None
+
+        self.history = PlayerHistoryStore()
+
+        # Improvement lines are fixed per dimension, so build each only once
+        self._improvement_texts: Dict[str, str] = {}
+
+        # Called with (action, scenario_context, score_card) after every calculate_score
+        self.listeners: List[Callable[[PlayerAction, Dict, ScoreCard], None]] = []
+
+    def calculate_score(
+        self,
+        player_action: PlayerAction,
+        scenario_context: Dict,
+        lazy: bool = False
+    ) -> ScoreCard:
+        """Calculate comprehensive score for a player's action.
+
+        With `lazy=True` a LazyScoreCard is returned and the breakdown,
+        improvement areas and explanation are only built when read.
+        """
         # Base scores for each dimension
         dimension_scores = self._calculate_dimension_scores(
             player_action.ethical_metrics,
             scenario_context
         )
+
+        # Update the player's rolling history before the bonus checks read it;
+        # keyed by action so rescoring the same action doesn't count it twice
+        self.history.observe(
+            scenario_context.get("player_id"),
+            dimension_scores,
+            key=action_key(player_action)
+        )
         
         # Calculate difficulty multiplier
         difficulty_multiplier = self._calculate_difficulty_multiplier(
@@ -50,10 +386,11 @@ class ScoringSystem:
         )
         
         # Calculate bonus points
-        bonus_points = self._calculate_bonus_points(
+        bonus_flags = self._calculate_bonus_flags(
             player_action,
             scenario_context
         )
+        bonus_points = self._bonus_for_flags(bonus_flags)
         
         # Calculate total score
         total_score = self._calculate_total_score(
@@ -61,6 +398,20 @@ class ScoringSystem:
             difficulty_multiplier,
             bonus_points
         )
+
+        if lazy:
+            score_card = LazyScoreCard(
+                self,
+                total_score=total_score,
+                dimension_scores=dimension_scores,
+                bonus_points=bonus_points,
+                difficulty_multiplier=difficulty_multiplier,
+                achieved=player_action.ethical_metrics,
+                targets=scenario_context["ethical_dimensions"],
+                bonus_flags=bonus_flags
+            )
+            self._notify(player_action, scenario_context, score_card)
+            return score_card
         
         # Generate improvement suggestions
         improvement_areas = self._identify_improvement_areas(dimension_scores)
@@ -72,14 +423,88 @@ class ScoringSystem:
             scenario_context
         )
         
-        return ScoreCard(
+        score_card = ScoreCard(
             total_score=total_score,
             dimension_scores=dimension_scores,
             improvement_areas=improvement_areas,
             bonus_points=bonus_points,
             difficulty_multiplier=difficulty_multiplier,
-            detailed_breakdown=detailed_breakdown
+            detailed_breakdown=detailed_breakdown,
+            bonus_flags=bonus_flags
         )
+        self._notify(player_action, scenario_context, score_card)
+        return score_card
+
+    def _notify(self, action: PlayerAction, context: Dict, score_card: ScoreCard):
+        """Hand a fresh result to every registered listener"""
+        for listener in self.listeners:
+            listener(action, context, score_card)
+
+    def calculate_scores_batch(
+        self,
+        achieved: np.ndarray,
+        targets: np.ndarray,
+        difficulties: np.ndarray,
+        bonus_points: Optional[np.ndarray] = None,
+        bonus_features: Optional[Dict[str, np.ndarray]] = None
+    ) -> ScoreBatch:
+        """Score many actions at once.
+
+        `achieved` and `targets` are (actions x dimensions) matrices with
+        columns in `dimension_weights` order; `difficulties` has one entry per
+        action. Bonuses are either given as `bonus_points` or evaluated by the
+        bonus rules over `bonus_features` columns (see bonus_feature_columns).
+        Results match calculate_score row for row.
+        """
+        bonus_flags = None
+        if bonus_features is not None:
+            engine = self.bonus_engine()
+            earned = engine.evaluate(bonus_features)
+            bonus_flags = engine.flags(earned)
+            bonus_points = earned @ np.array([self.bonus_thresholds[k] for k in engine.keys])
+
+        achieved = np.asarray(achieved, dtype=float)
+        targets = np.asarray(targets, dtype=float)
+        difficulties = np.asarray(difficulties, dtype=float)
+        weights = np.fromiter(self.dimension_weights.values(), dtype=float)
+        if bonus_points is None:
+            bonus_points = np.zeros(len(achieved), dtype=int)
+
+        dimension_scores = np.minimum(10, (achieved / targets) * 10 * weights)
+        difficulty_multipliers = 1 + (difficulties - 1) * 0.25
+        base_scores = dimension_scores.sum(axis=1) / dimension_scores.shape[1]
+        total_scores = base_scores * difficulty_multipliers + bonus_points
+
+        return ScoreBatch(
+            dimensions=tuple(self.dimension_weights),
+            achieved=achieved,
+            targets=targets,
+            dimension_scores=dimension_scores,
+            difficulty_multipliers=difficulty_multipliers,
+            bonus_points=np.asarray(bonus_points),
+            total_scores=total_scores,
+            scoring=self,
+            bonus_flags=bonus_flags
+        )
+
+    def bonus_engine(self) -> BonusRuleEngine:
+        """Rules compiled against the current bonus_criteria, recompiled on change"""
+        signature = (tuple(self.bonus_rules), tuple(self.bonus_criteria.items()))
+        if self._compiled_rules is None or self._compiled_rules[0] != signature:
+            self._compiled_rules = (signature, BonusRuleEngine(self.bonus_rules, self.bonus_criteria))
+        return self._compiled_rules[1]
+
+    def bonus_feature_columns(
+        self,
+        actions: Sequence[PlayerAction],
+        player_ids: Sequence[Optional[str]]
+    ) -> Dict[str, np.ndarray]:
+        """Per-action bonus features gathered into columns for a batch"""
+        rows = [self._bonus_features(a, p) for a, p in zip(actions, player_ids)]
+        return {
+            name: np.fromiter((row[name] for row in rows), dtype=float, count=len(rows))
+            for name in self.bonus_engine().features
+        }
 
     def _calculate_dimension_scores(
         self,
@@ -119,26 +544,59 @@ class ScoringSystem:
         context: Dict
     ) -> float:
         """Calculate bonus points for exceptional performance"""
+        return self._bonus_for_flags(self._calculate_bonus_flags(action, context))
+
+    def _calculate_bonus_flags(
+        self,
+        action: PlayerAction,
+        context: Dict
+    ) -> int:
+        """Bitmask of earned bonuses, bits in bonus_rules order"""
+        return self.bonus_engine().flags_one(
+            self._bonus_features(action, context.get("player_id"))
+        )
+
+    def _bonus_for_flags(self, flags: int) -> float:
+        """Sum the bonus_thresholds points for every earned bonus"""
         bonus = 0
-        
-        # Check for consistent improvement
-        if self._check_improvement_streak(action, context):
-            bonus += self.bonus_thresholds["consistent_improvement"]
-            
-        # Check stakeholder satisfaction
-        if self._check_stakeholder_satisfaction(action):
-            bonus += self.bonus_thresholds["stakeholder_satisfaction"]
-            
-        # Check for creative solutions
-        if self._check_creative_solution(action, context):
-            bonus += self.bonus_thresholds["creative_solution"]
-            
-        # Check community impact
-        if self._check_community_impact(action):
-            bonus += self.bonus_thresholds["community_impact"]
-            
+        for bit, key in enumerate(self.bonus_engine().keys):
+            if flags >> bit & 1:
+                bonus += self.bonus_thresholds[key]
         return bonus
 
+    def _bonus_features(self, action: PlayerAction, player_id: Optional[str]) -> Dict[str, float]:
+        """Feature values the bonus rules are written against"""
+        history = self.history.get(player_id)
+        impacts = action.stakeholder_impacts.values()
+        total_impact = sum(impacts)
+        return {
+            "streak": history.streak if history else 0,
+            "peak_gap": history.peak_gap if history else 0.0,
+            "min_impact": min(impacts, default=-math.inf),
+            "mean_impact": total_impact / len(impacts) if impacts else 0.0,
+            "total_impact": total_impact
+        }
+
+    def _check_rule(self, key: str, action: PlayerAction, context: Dict) -> bool:
+        bit = self.bonus_engine().keys.index(key)
+        return bool(self._calculate_bonus_flags(action, context) >> bit & 1)
+
+    def _check_improvement_streak(self, action: PlayerAction, context: Dict) -> bool:
+        """Player's recent actions kept improving on each other"""
+        return self._check_rule("consistent_improvement", action, context)
+
+    def _check_stakeholder_satisfaction(self, action: PlayerAction) -> bool:
+        """Nobody was harmed and stakeholders came out ahead on average"""
+        return self._check_rule("stakeholder_satisfaction", action, {})
+
+    def _check_creative_solution(self, action: PlayerAction, context: Dict) -> bool:
+        """A dimension clearly beat the player's own recent level"""
+        return self._check_rule("creative_solution", action, context)
+
+    def _check_community_impact(self, action: PlayerAction) -> bool:
+        """Total stakeholder impact is large enough to count for the community"""
+        return self._check_rule("community_impact", action, {})
+
     def _calculate_total_score(
         self,
         dimension_scores: Dict[str, float],
@@ -154,23 +612,23 @@ class ScoringSystem:
         dimension_scores: Dict[str, float]
     ) -> List[str]:
         """Identify areas needing improvement"""
-        improvements = []
-        for dimension, score in dimension_scores.items():
-            if score < 7:
-                improvements.append(f"Improve {dimension}: {self._get_improvement_suggestion(dimension)}")
-        return improvements
+        return [
+            self._improvement_text(dimension)
+            for dimension, score in dimension_scores.items()
+            if score < 7
+        ]
+
+    def _improvement_text(self, dimension: str) -> str:
+        """Full improvement line for a dimension, built once per dimension"""
+        text = self._improvement_texts.get(dimension)
+        if text is None:
+            text = f"Improve {dimension}: {self._get_improvement_suggestion(dimension)}"
+            self._improvement_texts[dimension] = text
+        return text
 
     def _get_improvement_suggestion(self, dimension: str) -> str:
         """Get specific improvement suggestion for a dimension"""
-        suggestions = {
-            "openness": "Consider being more transparent about your decision-making process",
-            "respect": "Try to acknowledge and address all stakeholders' perspectives",
-            "accountability": "Develop clearer ways to measure and track outcomes",
-            "practice": "Focus on making solutions more practically implementable",
-            "validation": "Create better ways for others to verify your approach",
-            "outcomes": "Consider longer-term implications of your decisions"
-        }
-        return suggestions.get(dimension, "Focus on improving this area")
+        return IMPROVEMENT_SUGGESTIONS.get(dimension, DEFAULT_SUGGESTION)
 
     def _generate_score_breakdown(
         self,
@@ -179,33 +637,49 @@ class ScoringSystem:
         context: Dict
     ) -> Dict[str, Dict[str, float]]:
         """Generate detailed score breakdown for explanation"""
+        return self._build_breakdown(
+            dimension_scores,
+            action.ethical_metrics,
+            context["ethical_dimensions"]
+        )
+
+    def _build_breakdown(
+        self,
+        dimension_scores: Dict[str, float],
+        achieved: Dict[str, float],
+        targets: Dict[str, float]
+    ) -> Dict[str, Dict[str, float]]:
+        """Per-dimension breakdown from achieved and target values"""
         breakdown = {}
         for dimension, score in dimension_scores.items():
             breakdown[dimension] = {
                 "base_score": score,
                 "weight": self.dimension_weights[dimension],
-                "target_value": context["ethical_dimensions"][dimension],
-                "achieved_value": action.ethical_metrics[dimension],
+                "target_value": targets[dimension],
+                "achieved_value": achieved[dimension],
                 "contribution_to_total": score * self.dimension_weights[dimension]
             }
         return breakdown
 
     def explain_score(self, score_card: ScoreCard) -> str:
         """Generate human-readable explanation of the score"""
-        explanation = [
-            f"Total Score: {score_card.total_score:.2f}",
-            "\nBreakdown by dimension:"
-        ]
+        # Lazy cards memoize their explanation
+        if isinstance(score_card, LazyScoreCard):
+            return score_card.explanation
+        return self._render_explanation(score_card)
+
+    def _render_explanation(self, score_card: ScoreCard) -> str:
+        """Fill the explanation templates for a score card"""
+        explanation = [_TOTAL_LINE(score_card.total_score), _BREAKDOWN_HEADER]
         
         for dimension, score in score_card.dimension_scores.items():
-            explanation.append(f"- {dimension.capitalize()}: {score:.2f}/10")
+            explanation.append(_DIMENSION_LINE(dimension.capitalize(), score))
             
         if score_card.bonus_points > 0:
-            explanation.append(f"\nBonus Points: +{score_card.bonus_points}")
+            explanation.append(_BONUS_LINE(score_card.bonus_points))
             
         if score_card.improvement_areas:
-            explanation.append("\nAreas for improvement:")
-            for area in score_card.improvement_areas:
-                explanation.append(f"- {area}")
+            explanation.append(_IMPROVEMENT_HEADER)
+            explanation.extend(map(_IMPROVEMENT_LINE, score_card.improvement_areas))
                 
         return "\n".join(explanation)
@@ -0,0 +1,6 @@
+"""Reproducible integer seeds derived from a root seed"""
+import numpy as np
+
+def derive_seed(root_seed: int, *key: int) -> int:
+    """Seed for the independent stream named by `key`, the same on every run and worker"""
+    return int(np.random.SeedSequence(root_seed, spawn_key=key).generate_state(1)[0])
@@ -0,0 +1,218 @@
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import json
+import os
+
+import numpy as np
+
+from game_modules import load_module
+
+economic_system = load_module("economic-system.py")
+CommunityState = economic_system.CommunityState
+EthicalEconomySimulator = economic_system.EthicalEconomySimulator
+EthicalScoreBatch = economic_system.EthicalScoreBatch
+LocalGovernanceSimulator = economic_system.LocalGovernanceSimulator
+MarketPositionBatch = economic_system.MarketPositionBatch
+
+# (round, rng) -> proposals for that round's governance cycle
+ProposalSource = Callable[[int, np.random.Generator], List[Dict]]
+# (round, ethics, rng) -> ethics for the next round
+EthicsStep = Callable[[int, EthicalScoreBatch, np.random.Generator], EthicalScoreBatch]
+
+@dataclass
+class RoundSummary:
+    round: int
+    mean_capital: float
+    capital_gini: float
+    mean_tax_rate: float
+    mean_influence: float
+    average_ethics: float
+    economic_health: float
+    social_cohesion: float
+
+def capital_gini(capital: np.ndarray) -> float:
+    """Gini coefficient of the capital distribution"""
+    values = np.sort(capital)
+    n = len(values)
+    total = values.sum()
+    if n == 0 or total == 0:
+        return 0.0
+    ranks = np.arange(1, n + 1)
+    return float(2 * np.dot(ranks, values) / (n * total) - (n + 1) / n)
+
+def random_population(
+    count: int,
+    rng: np.random.Generator,
+    resource_keys: Tuple[str, ...] = ()
+) -> Tuple[MarketPositionBatch, EthicalScoreBatch]:
+    """Synthetic population for what-if runs, sweeps and benchmarks"""
+    players = MarketPositionBatch(
+        capital=rng.lognormal(mean=3.0, sigma=1.0, size=count),
+        resources=np.zeros((count, len(resource_keys))),
+        influence=rng.uniform(0.01, 0.2, count),
+        tax_rate=np.full(count, 0.2),
+        benefits=np.zeros((count, len(economic_system.BENEFIT_KEYS))),
+        resource_keys=tuple(resource_keys)
+    )
+    ethics = EthicalScoreBatch(
+        base_score=rng.beta(5, 3, count),
+        community_impact=rng.beta(2, 5, count),
+        trend=rng.normal(0, 0.5, count)
+    )
+    return players, ethics
+
+def random_proposals(count: int = 10) -> ProposalSource:
+    """Proposal source drawing uniform support levels each round"""
+    def source(round_number: int, rng: np.random.Generator) -> List[Dict]:
+        return [{"support": support} for support in rng.uniform(0, 1, count)]
+    return source
+
+class SimulationEngine:
+    """Steps a population through rounds of market dynamics and governance.
+
+    Player state lives in columnar batches; only the current round is kept in
+    memory. Per-round aggregates are yielded as they are produced and a
+    checkpoint is written every `checkpoint_every` rounds so a run can resume.
+    """
+
+    CHECKPOINT_FILE = "checkpoint.npz"
+
+    def __init__(
+        self,
+        economy: EthicalEconomySimulator,
+        governance: LocalGovernanceSimulator,
+        players: MarketPositionBatch,
+        ethics: EthicalScoreBatch,
+        community: CommunityState,
+        proposal_source: Optional[ProposalSource] = None,
+        ethics_step: Optional[EthicsStep] = None,
+        checkpoint_dir: Optional[str] = None,
+        checkpoint_every: int = 10,
+        seed: int = 0
+    ):
+        self.economy = economy
+        self.governance = governance
+        self.players = players
+        self.ethics = ethics
+        self.community = community
+        self.proposal_source = proposal_source or random_proposals()
+        self.ethics_step = ethics_step
+        self.checkpoint_dir = Path(checkpoint_dir) if checkpoint_dir else None
+        self.checkpoint_every = checkpoint_every
+        self.rng = np.random.default_rng(seed)
+        self.round = 0
+
+    def run(self, rounds: int) -> Iterator[RoundSummary]:
+        """Advance until `rounds` total rounds have run, yielding each summary"""
+        while self.round < rounds:
+            summary = self.step()
+            if self.checkpoint_dir and self.round % self.checkpoint_every == 0:
+                self.save_checkpoint()
+            yield summary
+        if self.checkpoint_dir:
+            self.save_checkpoint()
+
+    def step(self) -> RoundSummary:
+        """Run one round of market dynamics followed by a governance cycle"""
+        self.community = replace(
+            self.community,
+            average_ethics=float(self.ethics.base_score.mean())
+        )
+
+        self.players = self.economy.simulate_market_dynamics_batch(
+            self.players,
+            self.ethics,
+            self.community
+        )
+
+        proposals = self.proposal_source(self.round, self.rng)
+        self.community = self.governance.simulate_governance_cycle_batch(
+            self.community,
+            proposals,
+            self.ethics
+        )
+
+        if self.ethics_step:
+            self.ethics = self.ethics_step(self.round, self.ethics, self.rng)
+
+        self.round += 1
+        return self._summarize()
+
+    def _summarize(self) -> RoundSummary:
+        """Aggregate the current round into a single summary row"""
+        return RoundSummary(
+            round=self.round,
+            mean_capital=float(self.players.capital.mean()),
+            capital_gini=capital_gini(self.players.capital),
+            mean_tax_rate=float(self.players.tax_rate.mean()),
+            mean_influence=float(self.players.influence.mean()),
+            average_ethics=self.community.average_ethics,
+            economic_health=self.community.economic_health,
+            social_cohesion=self.community.social_cohesion
+        )
+
+    def save_checkpoint(self) -> Path:
+        """Atomically write the current state to the checkpoint directory"""
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        path = self.checkpoint_dir / self.CHECKPOINT_FILE
+        tmp_path = path.with_suffix(".tmp.npz")
+
+        meta = {
+            "round": self.round,
+            "community": asdict(self.community),
+            "resource_keys": list(self.players.resource_keys),
+            "rng_state": self.rng.bit_generator.state
+        }
+        np.savez(
+            tmp_path,
+            capital=self.players.capital,
+            resources=self.players.resources,
+            influence=self.players.influence,
+            tax_rate=self.players.tax_rate,
+            benefits=self.players.benefits,
+            base_score=self.ethics.base_score,
+            community_impact=self.ethics.community_impact,
+            trend=self.ethics.trend,
+            meta=np.array(json.dumps(meta))
+        )
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def resume(
+        cls,
+        checkpoint_dir: str,
+        economy: EthicalEconomySimulator,
+        governance: LocalGovernanceSimulator,
+        **kwargs
+    ) -> "SimulationEngine":
+        """Rebuild an engine from the last checkpoint in `checkpoint_dir`"""
+        with np.load(Path(checkpoint_dir) / cls.CHECKPOINT_FILE) as data:
+            meta = json.loads(str(data["meta"]))
+            players = MarketPositionBatch(
+                capital=data["capital"],
+                resources=data["resources"],
+                influence=data["influence"],
+                tax_rate=data["tax_rate"],
+                benefits=data["benefits"],
+                resource_keys=tuple(meta["resource_keys"])
+            )
+            ethics = EthicalScoreBatch(
+                base_score=data["base_score"],
+                community_impact=data["community_impact"],
+                trend=data["trend"]
+            )
+
+        engine = cls(
+            economy,
+            governance,
+            players,
+            ethics,
+            CommunityState(**meta["community"]),
+            checkpoint_dir=checkpoint_dir,
+            **kwargs
+        )
+        engine.round = meta["round"]
+        engine.rng.bit_generator.state = meta["rng_state"]
+        return engine
@@ -0,0 +1,227 @@
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+import argparse
+import json
+import os
+import sys
+
+from game_modules import load_module
+
+scenario_system = load_module("scenario-system.py")
+
+@dataclass
+class ContactStats:
+    interactions: int = 0
+    last_seen: float = 0.0
+    relationships: Dict[str, int] = field(default_factory=dict)  # type -> count
+    interests: List[str] = field(default_factory=list)
+    communication_style: str = ""
+
+    @property
+    def relationship(self) -> str:
+        return max(self.relationships, key=self.relationships.get, default="")
+
+class BoundedStats:
+    """Per-key stats that keep memory bounded by pruning the least active keys.
+
+    Up to `capacity * (1 + slack)` keys are held; past that, only the
+    `capacity` keys with the most interactions survive. Pruning in batches
+    keeps the cost amortized O(1) per update.
+    """
+    def __init__(self, capacity: int, slack: float = 0.25):
+        self.capacity = capacity
+        self.slack = slack
+        self.items: Dict[str, ContactStats] = {}
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def touch(self, key: str, timestamp: float, count: int = 1) -> ContactStats:
+        stats = self.items.get(key)
+        if stats is None:
+            if len(self.items) >= self.capacity * (1 + self.slack):
+                self.prune()
+            stats = self.items[key] = ContactStats()
+        stats.interactions += count
+        stats.last_seen = max(stats.last_seen, timestamp)
+        return stats
+
+    def prune(self):
+        ranked = sorted(self.items.items(), key=lambda kv: (kv[1].interactions, kv[1].last_seen), reverse=True)
+        self.dropped += len(ranked) - self.capacity
+        self.items = dict(ranked[:self.capacity])
+
+@dataclass
+class IngestState:
+    """Everything needed to resume an ingestion: position plus aggregates"""
+    path: str
+    owner: str
+    offset: int = 0
+    records: int = 0
+    malformed: int = 0
+    contacts: BoundedStats = field(default_factory=lambda: BoundedStats(5_000))
+    pairs: BoundedStats = field(default_factory=lambda: BoundedStats(20_000))
+
+    def to_json(self) -> Dict:
+        return {
+            "path": self.path,
+            "owner": self.owner,
+            "offset": self.offset,
+            "records": self.records,
+            "malformed": self.malformed,
+            "contacts": {
+                "capacity": self.contacts.capacity,
+                "dropped": self.contacts.dropped,
+                "items": {k: asdict(v) for k, v in self.contacts.items.items()}
+            },
+            "pairs": {
+                "capacity": self.pairs.capacity,
+                "dropped": self.pairs.dropped,
+                "items": {k: asdict(v) for k, v in self.pairs.items.items()}
+            }
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "IngestState":
+        def stats(section: Dict) -> BoundedStats:
+            bounded = BoundedStats(section["capacity"])
+            bounded.dropped = section["dropped"]
+            bounded.items = {k: ContactStats(**v) for k, v in section["items"].items()}
+            return bounded
+        return cls(
+            path=data["path"],
+            owner=data["owner"],
+            offset=data["offset"],
+            records=data["records"],
+            malformed=data["malformed"],
+            contacts=stats(data["contacts"]),
+            pairs=stats(data["pairs"])
+        )
+
+    def save(self, checkpoint_path: str):
+        """Write atomically so a crash never leaves a half-written checkpoint"""
+        tmp_path = f"{checkpoint_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_json(), f)
+        os.replace(tmp_path, checkpoint_path)
+
+    @classmethod
+    def load(cls, checkpoint_path: str) -> "IngestState":
+        with open(checkpoint_path) as f:
+            return cls.from_json(json.load(f))
+
+    def social_graph(self) -> "scenario_system.SocialGraph":
+        """The structured social context ScenarioGenerator consumes"""
+        graph = scenario_system.SocialGraph(self.owner)
+        for name, stats in self.contacts.items.items():
+            graph.record_interaction(self.owner, name, stats.relationship, stats.last_seen, stats.interactions)
+            if stats.interests or stats.communication_style:
+                graph.add_profile(scenario_system.Stakeholder(
+                    name,
+                    stats.relationship,
+                    list(stats.interests),
+                    stats.communication_style or "unknown"
+                ))
+        for key, stats in self.pairs.items.items():
+            a, b = key.split("\t", 1)
+            if a in self.contacts.items and b in self.contacts.items:
+                graph.record_interaction(a, b, "", stats.last_seen, stats.interactions)
+        return graph
+
+# --- Pipeline stages ------------------------------------------------------
+
+def read_lines(path: str, offset: int = 0) -> Iterator[Tuple[bytes, int]]:
+    """Complete lines from `offset` on, each with the offset just past it.
+
+    A trailing line without a newline is left for the next run, so resuming
+    from any yielded offset never splits a record.
+    """
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                return
+            offset += len(line)
+            yield line, offset
+
+def parse_records(
+    lines: Iterator[Tuple[bytes, int]],
+    state: IngestState
+) -> Iterator[Tuple["scenario_system.Interaction", int]]:
+    """Decode and validate JSON records, counting and skipping malformed ones"""
+    for line, offset in lines:
+        if not line.strip():
+            continue
+        try:
+            interaction = scenario_system.parse_interaction(json.loads(line))
+        except ValueError:
+            state.malformed += 1
+            state.offset = offset
+            continue
+        yield interaction, offset
+
+def aggregate(
+    interactions: Iterator[Tuple["scenario_system.Interaction", int]],
+    state: IngestState
+) -> Iterator[int]:
+    """Fold each record into the bounded aggregates; yields the new offset"""
+    for interaction, offset in interactions:
+        # The owner's edge to the contact always comes first, so `stats` is the contact's
+        for source, target, relationship, timestamp, count in scenario_system.interaction_edges(interaction, state.owner):
+            if source != state.owner:
+                state.pairs.touch("\t".join(sorted((source, target))), timestamp, count)
+                continue
+            stats = state.contacts.touch(target, timestamp, count)
+            if relationship:
+                stats.relationships[relationship] = stats.relationships.get(relationship, 0) + 1
+        if interaction.interests:
+            stats.interests = interaction.interests[:10]
+        if interaction.communication_style:
+            stats.communication_style = interaction.communication_style
+        state.records += 1
+        state.offset = offset
+        yield offset
+
+def ingest(
+    path: str,
+    owner: str = "player",
+    state: Optional[IngestState] = None,
+    checkpoint_path: Optional[str] = None,
+    checkpoint_every: int = 100_000,
+    max_contacts: int = 5_000
+) -> IngestState:
+    """Stream an export into bounded aggregates, resuming from `state` or a checkpoint"""
+    if state is None and checkpoint_path and Path(checkpoint_path).exists():
+        state = IngestState.load(checkpoint_path)
+    if state is None:
+        state = IngestState(path, owner, contacts=BoundedStats(max_contacts), pairs=BoundedStats(4 * max_contacts))
+
+    pipeline = aggregate(parse_records(read_lines(path, state.offset), state), state)
+    for count, _ in enumerate(pipeline, 1):
+        if checkpoint_path and count % checkpoint_every == 0:
+            state.save(checkpoint_path)
+    if checkpoint_path:
+        state.save(checkpoint_path)
+    return state
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Stream a line-delimited social export into a social graph")
+    parser.add_argument("export", help="JSON-lines file, one interaction per line")
+    parser.add_argument("--owner", default="player")
+    parser.add_argument("--checkpoint", help="resume from and save progress to this file")
+    parser.add_argument("--max-contacts", type=int, default=5_000)
+    args = parser.parse_args(argv)
+
+    state = ingest(args.export, args.owner, checkpoint_path=args.checkpoint, max_contacts=args.max_contacts)
+    graph = state.social_graph()
+    print(f"{state.records} records ({state.malformed} malformed) up to byte {state.offset}")
+    print(f"{len(graph)} contacts kept, {state.contacts.dropped} dropped by pruning")
+    top = sorted(graph.neighbors().items(), key=lambda kv: kv[1].interactions, reverse=True)[:10]
+    for name, edge in top:
+        print(f"- {name}: {edge.interactions} interactions ({edge.relationship or 'unknown'})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,481 @@
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+
+from game_modules import load_module
+
+telegram_system = load_module("telegram-system.py")
+scenario_system = telegram_system.scenario_system
+scenario_pool = telegram_system.scenario_pool
+
+# --- Fake Bot API ---------------------------------------------------------
+
+class FakeBotAPI:
+    """Local stand-in for the Telegram Bot API: getUpdates and sendMessage only.
+
+    inject() queues an incoming message as an update; getUpdates long-polls
+    for them. Every sendMessage that replies to an injected message records
+    the round-trip latency. Messages may carry a non-standard "context" dict
+    so synthetic actions can include their ethical metrics.
+    """
+    def __init__(self, token: str = "test-token"):
+        self.token = token
+        self.latencies: List[float] = []
+        self.sent = 0
+        self._updates: Deque[Dict] = deque()
+        self._next_update_id = 1
+        self._next_message_id = 1
+        self._injected: Dict[Tuple[int, int], float] = {}  # (chat_id, message_id) -> time
+        self._arrived = asyncio.Event()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+    @property
+    def pending(self) -> int:
+        """Injected messages that have not been answered yet"""
+        return len(self._injected)
+
+    def inject(self, chat_id: int, text: str, context: Optional[Dict] = None):
+        message = {
+            "message_id": self._next_message_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "text": text
+        }
+        if context:
+            message["context"] = context
+        self._injected[(chat_id, self._next_message_id)] = time.perf_counter()
+        self._updates.append({"update_id": self._next_update_id, "message": message})
+        self._next_update_id += 1
+        self._next_message_id += 1
+        self._arrived.set()
+
+    async def get_updates(self, offset: int = 0, limit: int = 100, timeout: float = 0) -> List[Dict]:
+        # Confirmed updates (id < offset) are dropped, as in the real API
+        while self._updates and self._updates[0]["update_id"] < offset:
+            self._updates.popleft()
+        if not self._updates and timeout > 0:
+            self._arrived.clear()
+            try:
+                await asyncio.wait_for(self._arrived.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return list(itertools.islice(self._updates, int(limit)))
+
+    def send_message(self, chat_id: int, text: str, reply_to_message_id: Optional[int] = None) -> Dict:
+        self.sent += 1
+        injected_at = self._injected.pop((int(chat_id), reply_to_message_id), None)
+        if injected_at is not None:
+            self.latencies.append(time.perf_counter() - injected_at)
+        message_id = self._next_message_id
+        self._next_message_id += 1
+        return {"message_id": message_id, "chat": {"id": chat_id}, "text": text}
+
+    async def _dispatch(self, method: str, params: Dict):
+        if method == "getUpdates":
+            return await self.get_updates(
+                int(params.get("offset", 0)),
+                int(params.get("limit", 100)),
+                float(params.get("timeout", 0))
+            )
+        if method == "sendMessage":
+            reply_to = params.get("reply_to_message_id")
+            return self.send_message(
+                int(params["chat_id"]),
+                params.get("text", ""),
+                int(reply_to) if reply_to is not None else None
+            )
+        raise KeyError(method)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Minimal HTTP/1.1 with keep-alive"""
+        self._connections[asyncio.current_task()] = writer
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                _, target, _ = request_line.decode().split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                url = urlsplit(target)
+                params = dict(parse_qsl(url.query))
+                if body:
+                    params.update(json.loads(body))
+                prefix, _, method = url.path.rpartition("/")
+                if prefix != f"/bot{self.token}":
+                    status, payload = "401 Unauthorized", {"ok": False, "error_code": 401}
+                else:
+                    try:
+                        status, payload = "200 OK", {"ok": True, "result": await self._dispatch(method, params)}
+                    except KeyError:
+                        status, payload = "404 Not Found", {"ok": False, "error_code": 404}
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.pop(asyncio.current_task(), None)
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        self._server = await asyncio.start_server(self._serve, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            # Closing the transports ends each handler's read loop; wake any long poll too
+            for writer in self._connections.values():
+                writer.close()
+            self._arrived.set()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+
+# --- Bot side -------------------------------------------------------------
+
+class BotClient:
+    """One keep-alive HTTP connection to the Bot API; calls are serialized"""
+    def __init__(self, host: str, port: int, token: str):
+        self.host = host
+        self.port = port
+        self.token = token
+        self._lock = asyncio.Lock()
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def call(self, method: str, payload: Dict):
+        async with self._lock:
+            if self._writer is None:
+                self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+            body = json.dumps(payload).encode()
+            self._writer.write(
+                f"POST /bot{self.token}/{method} HTTP/1.1\r\nHost: {self.host}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+            )
+            await self._writer.drain()
+            await self._reader.readline()  # status line
+            length = 0
+            while True:
+                line = await self._reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode().partition(":")
+                if name.strip().lower() == "content-length":
+                    length = int(value)
+            reply = json.loads(await self._reader.readexactly(length))
+        if not reply["ok"]:
+            raise RuntimeError(f"{method} failed: {reply}")
+        return reply["result"]
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+class PollingBot:
+    """Long-polls getUpdates, feeds a ChatDispatcher and replies with sendMessage"""
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        token: str,
+        dispatcher_workers: int = 64,
+        senders: int = 8,
+        pool: bool = False
+    ):
+        self.poller = BotClient(host, port, token)
+        self.senders: asyncio.Queue = asyncio.Queue()
+        self._clients = [BotClient(host, port, token) for _ in range(senders)]
+        for client in self._clients:
+            self.senders.put_nowait(client)
+        self.handler_latencies: List[float] = []
+        self.failures = 0
+        self.generator = scenario_system.ScenarioGenerator()
+        self.scoring = telegram_system.ScoringSystem()
+        self.responses = telegram_system.response_cache.ResponseCache()
+        # With a pool every player shares one profile and scenarios are served pre-generated
+        self.pool = scenario_pool.ScenarioPool(self.generator, {"shared": synthetic_context(0)}) if pool else None
+        self.dispatcher = telegram_system.ChatDispatcher(
+            self._make_agent,
+            workers=dispatcher_workers,
+            on_response=self._reply
+        )
+        self._task: Optional[asyncio.Task] = None
+
+    def _make_agent(self, chat_id: str) -> "telegram_system.SupervisingAgent":
+        agent = telegram_system.SupervisingAgent(self.generator, self.scoring, responses=self.responses, scenarios=self.pool)
+        if self.pool is not None:
+            agent.use_profile("shared")
+        else:
+            agent.player_context = synthetic_context(int(chat_id))
+        handle = agent.handle_message
+
+        async def timed(message):
+            start = time.perf_counter()
+            try:
+                return await handle(message)
+            except Exception:
+                self.failures += 1
+                raise
+            finally:
+                self.handler_latencies.append(time.perf_counter() - start)
+        agent.handle_message = timed
+        return agent
+
+    async def _reply(self, message: "telegram_system.Message", response: "telegram_system.Response"):
+        client = await self.senders.get()
+        try:
+            await client.call("sendMessage", {
+                "chat_id": int(message.chat_id),
+                "text": response.content,
+                "reply_to_message_id": message.context.get("message_id")
+            })
+        finally:
+            self.senders.put_nowait(client)
+
+    async def _poll(self):
+        offset = 0
+        while True:
+            updates = await self.poller.call("getUpdates", {"offset": offset, "timeout": 1, "limit": 500})
+            for update in updates:
+                offset = update["update_id"] + 1
+                incoming = update.get("message")
+                if not incoming or "text" not in incoming:
+                    continue
+                context = dict(incoming.get("context", {}))
+                context["message_id"] = incoming["message_id"]
+                await self.dispatcher.submit(telegram_system.Message(
+                    content=incoming["text"],
+                    type=context.pop("type", ""),
+                    context=context,
+                    timestamp=float(incoming["date"]),
+                    chat_id=str(incoming["chat"]["id"])
+                ))
+
+    def start(self):
+        if self.pool is not None:
+            self.pool.start()
+        self.dispatcher.start()
+        self._task = asyncio.get_running_loop().create_task(self._poll())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        await self.dispatcher.stop()
+        if self.pool is not None:
+            await self.pool.stop()
+        for client in [self.poller, *self._clients]:
+            await client.close()
+
+# --- Load generation ------------------------------------------------------
+
+# Synthetic conversation a virtual player walks through, in order
+SCRIPT = [
+    ("new scenario please", None),
+    ("what are my options?", None),
+    ("I talk to everyone involved", "action"),
+    ("why did I get this score?", None),
+    ("how can I improve?", None),
+    ("this scoring is unfair", None),
+    ("I propose a compromise", "action"),
+    ("you should add a different scenario", None)
+]
+
+def synthetic_context(player: int) -> "scenario_system.Context":
+    return scenario_system.Context(
+        location="building",
+        time_frame="week",
+        social_circle=[
+            scenario_system.Stakeholder(f"neighbor-{player}-{i}", "neighbor", [], "direct")
+            for i in range(8)
+        ],
+        recent_events=["a noisy party"],
+        constraints=[]
+    )
+
+def synthetic_stream(players: int, messages: int, seed: int = 0) -> Iterator[Tuple[int, str, Dict]]:
+    """(chat_id, text, context) for every player, interleaved randomly"""
+    rng = random.Random(seed)
+    remaining = {player: 0 for player in range(1, players + 1)}
+    while remaining:
+        player = rng.choice(list(remaining)) if len(remaining) < 64 else rng.randint(1, players)
+        if player not in remaining:
+            continue
+        step = remaining[player]
+        text, kind = SCRIPT[step % len(SCRIPT)]
+        context = {}
+        if kind == "action":
+            context = {
+                "type": "action",
+                "ethical_metrics": {d: rng.uniform(0.2, 3.0) for d in scenario_system.ETHICAL_DIMENSIONS}
+            }
+        yield player, text, context
+        remaining[player] = step + 1
+        if step + 1 >= messages:
+            del remaining[player]
+
+def replay_stream(path: str) -> Iterator[Tuple[int, str, Dict]]:
+    """Recorded stream: JSON lines with chat_id, text and optional context"""
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield int(record["chat_id"]), record["text"], record.get("context", {})
+
+def rss_mib() -> float:
+    """Resident set size of this process, from /proc (Linux)"""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+@dataclass
+class LoadReport:
+    messages: int
+    answered: int
+    failures: int
+    duration_s: float
+    throughput: float           # answered messages per second
+    end_to_end_ms: Dict[str, float]
+    handler_ms: Dict[str, float]
+    handler_busy_s: float       # summed handle_message latency
+    handler_throughput: float   # handle_message calls per second of busy time
+    rss_start_mib: float
+    rss_end_mib: float
+    rss_samples: List[Tuple[float, float]] = field(default_factory=list)
+
+    @property
+    def rss_growth_mib(self) -> float:
+        return self.rss_end_mib - self.rss_start_mib
+
+    def format(self) -> str:
+        def row(name, ms):
+            return f"{name:12} p50 {ms['p50']:8.2f} ms  p95 {ms['p95']:8.2f} ms  p99 {ms['p99']:8.2f} ms"
+        return "\n".join([
+            f"Messages: {self.messages} sent, {self.answered} answered, {self.failures} handler errors",
+            f"Duration: {self.duration_s:.2f} s, {self.throughput:,.0f} msg/s end to end, "
+            f"{self.handler_throughput:,.0f} handle_message/s over {self.handler_busy_s:.2f} s busy",
+            row("end to end", self.end_to_end_ms),
+            row("handler", self.handler_ms),
+            f"RSS: {self.rss_start_mib:.1f} -> {self.rss_end_mib:.1f} MiB ({self.rss_growth_mib:+.1f})"
+        ])
+
+def _percentiles(seconds: List[float]) -> Dict[str, float]:
+    if not seconds:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    values = np.percentile(np.array(seconds) * 1_000, [50, 95, 99])
+    return dict(zip(("p50", "p95", "p99"), values.tolist()))
+
+async def run_load(
+    stream: Iterator[Tuple[int, str, Dict]],
+    rate: float = 2_000.0,
+    workers: int = 64,
+    drain_timeout: float = 30.0,
+    sample_every: float = 0.5,
+    pool: bool = False
+) -> LoadReport:
+    """Replay `stream` at `rate` messages/s through a fake API and a polling bot.
+
+    A rate of 0 injects as fast as possible, to measure saturation throughput
+    rather than how well the bot keeps up with a given load.
+    """
+    api = FakeBotAPI()
+    port = await api.start()
+    bot = PollingBot("127.0.0.1", port, api.token, dispatcher_workers=workers, pool=pool)
+    bot.start()
+
+    started = time.perf_counter()
+    samples = [(0.0, rss_mib())]
+
+    async def sample_memory():
+        while True:
+            await asyncio.sleep(sample_every)
+            samples.append((time.perf_counter() - started, rss_mib()))
+    sampler = asyncio.get_running_loop().create_task(sample_memory())
+
+    sent = 0
+    for chat_id, text, context in stream:
+        api.inject(chat_id, text, context)
+        sent += 1
+        if rate <= 0:
+            if sent % 500 == 0:
+                await asyncio.sleep(0)  # let the bot start draining
+            continue
+        # Pace injections; sleeping in small batches keeps timer overhead low
+        ahead = sent / rate - (time.perf_counter() - started)
+        if ahead > 0.005:
+            await asyncio.sleep(ahead)
+
+    deadline = time.perf_counter() + drain_timeout
+    while api.pending > bot.failures and time.perf_counter() < deadline:
+        await asyncio.sleep(0.05)
+    duration = time.perf_counter() - started
+
+    sampler.cancel()
+    samples.append((duration, rss_mib()))
+    await bot.stop()
+    await api.stop()
+
+    answered = len(api.latencies)
+    busy = sum(bot.handler_latencies)
+    return LoadReport(
+        messages=sent,
+        answered=answered,
+        failures=bot.failures,
+        duration_s=duration,
+        throughput=answered / duration if duration else 0.0,
+        end_to_end_ms=_percentiles(api.latencies),
+        handler_ms=_percentiles(bot.handler_latencies),
+        handler_busy_s=busy,
+        handler_throughput=len(bot.handler_latencies) / busy if busy else 0.0,
+        rss_start_mib=samples[0][1],
+        rss_end_mib=samples[-1][1],
+        rss_samples=samples
+    )
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test SupervisingAgent against a local fake Bot API")
+    parser.add_argument("--players", type=int, default=2_000)
+    parser.add_argument("--messages", type=int, default=8, help="messages per virtual player")
+    parser.add_argument("--rate", type=float, default=2_000.0, help="injected messages per second; 0 for unpaced saturation")
+    parser.add_argument("--workers", type=int, default=64, help="dispatcher worker tasks")
+    parser.add_argument("--replay", help="JSON-lines recording to replay instead of synthetic players")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pool", action="store_true", help="serve new scenarios from a warm ScenarioPool")
+    parser.add_argument("--save", help="write the report as JSON")
+    args = parser.parse_args(argv)
+
+    stream = replay_stream(args.replay) if args.replay else synthetic_stream(args.players, args.messages, args.seed)
+    report = asyncio.run(run_load(stream, args.rate, args.workers, pool=args.pool))
+    print(report.format())
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({**asdict(report), "rss_growth_mib": report.rss_growth_mib}, f, indent=2)
+    return 0 if report.answered + report.failures >= report.messages else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,51 @@
-from dataclasses import dataclass
-from typing import List, Dict, Optional
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import Awaitable, Callable, List, Dict, Optional, Set
 import asyncio
+import logging
+import time
+
+from game_modules import load_module
+
+scenario_system = load_module("scenario-system.py")
+scoring_system = load_module("scoring-system.py")
+chat_history = load_module("chat-history.py")
+intent_classifier = load_module("intent-classifier.py")
+response_cache = load_module("response-cache.py")
+scenario_pool = load_module("scenario-pool.py")
+ScenarioGenerator = scenario_system.ScenarioGenerator
+ScoringSystem = scoring_system.ScoringSystem
+
+logger = logging.getLogger(__name__)
+
+# Keyword cues per message type and subtype, checked in order; the first match wins.
+# Cues match whole words, and questions outrank suggestions so "How should I improve?" is a question.
+MESSAGE_TYPE_KEYWORDS = {
+    "complaint": ["unfair", "not fair", "wrong", "unrealistic", "doesn't make sense"],
+    "question": ["?", "why", "how", "what", "explain"],
+    "suggestion": ["suggest", "should", "would be nice", "new scenario", "another scenario"]
+}
+QUESTION_KEYWORDS = {
+    "score_explanation": ["why did i get", "my score", "score", "scores", "scoring", "points"],
+    "scenario_clarification": ["what are my options", "options", "scenario", "what happened", "who is"],
+    "improvement_advice": ["improve", "better", "advice", "tips"]
+}
+COMPLAINT_KEYWORDS = {
+    "unfair_scoring": ["unfair", "score", "scores", "scoring", "points", "wrong"],
+    "unrealistic_scenario": ["unrealistic", "doesn't make sense", "not realistic", "scenario", "scenarios"]
+}
+SUGGESTION_KEYWORDS = {
+    "new_scenario": ["new scenario", "another scenario", "different scenario", "scenario", "scenarios"],
+    "system_improvement": ["feature", "should", "could you", "would be nice"]
+}
+
+# Every table compiled into one automaton, so a message is scanned once for type and all subtypes
+INTENTS = intent_classifier.IntentClassifier({
+    "type": MESSAGE_TYPE_KEYWORDS,
+    "question": QUESTION_KEYWORDS,
+    "complaint": COMPLAINT_KEYWORDS,
+    "suggestion": SUGGESTION_KEYWORDS
+})
 
 @dataclass
 class Message:
@@ -8,6 +53,7 @@ class Message:
     type: str  # question, complaint, suggestion, action
     context: Dict
     timestamp: float
+    chat_id: Optional[str] = None
 
 @dataclass
 class Response:
@@ -20,25 +66,86 @@ class SupervisingAgent:
     def __init__(
         self,
         scenario_generator: ScenarioGenerator,
-        scoring_system: ScoringSystem
+        scoring_system: ScoringSystem,
+        history: Optional["chat_history.ChatHistory"] = None,
+        responses: Optional["response_cache.ResponseCache"] = None,
+        scenarios: Optional["scenario_pool.ScenarioPool"] = None
     ):
         self.scenario_generator = scenario_generator
+        # Warm pool shared across chats; used while the player's context is one of its profiles
+        self.scenarios = scenarios
+        self.scenario_profile: Optional[str] = None
         self.scoring_system = scoring_system
-        self.conversation_history = []
-        self.current_scenario = None
+        # Recent messages only; a ChatHistory spills older ones to disk
+        self.conversation_history = history if history is not None else deque(maxlen=chat_history.RECENT_MESSAGES)
+        self.responses = responses if responses is not None else response_cache.ResponseCache(max_entries=64)
+        # Computed lazily: most scenarios and score cards are never asked about
+        self._fingerprints: Dict[str, Optional[str]] = {"scenario": None, "score_card": None}
+        self._current_scenario = None
         self.player_context = None
+        self._last_score_card = None
+        self.intents = INTENTS
+
+    def _replace(self, slot: str, value, current):
+        """Drop answers cached for the scenario or score card being replaced"""
+        if value is current:
+            return
+        old = self._fingerprints[slot]
+        if old is not None:
+            self.responses.invalidate(old)
+        self._fingerprints[slot] = None
+
+    def _fingerprint(self, slot: str, value) -> str:
+        fingerprint = self._fingerprints[slot]
+        if fingerprint is None:
+            fingerprint = self._fingerprints[slot] = response_cache.fingerprint(value)
+        return fingerprint
+
+    @property
+    def current_scenario(self):
+        return self._current_scenario
+
+    @current_scenario.setter
+    def current_scenario(self, scenario):
+        self._replace("scenario", scenario, self._current_scenario)
+        self._current_scenario = scenario
+
+    @property
+    def last_score_card(self):
+        return self._last_score_card
+
+    @last_score_card.setter
+    def last_score_card(self, score_card):
+        self._replace("score_card", score_card, self._last_score_card)
+        self._last_score_card = score_card
+
+    def set_player_context(self, context: "scenario_system.Context"):
+        """Personal context for new scenarios; replaces any pool profile"""
+        self.player_context = context
+        self.scenario_profile = None
+
+    def use_profile(self, profile: str):
+        """Take the player's context from a scenario pool profile, so new scenarios come pre-generated"""
+        self.player_context = self.scenarios.profiles[profile]
+        self.scenario_profile = profile
 
     async def handle_message(self, message: Message) -> Response:
         """Handle incoming player message"""
+        if "social_data" in message.context:
+            # Keep the export itself out of the history ring buffer and its spill log
+            context = {k: v for k, v in message.context.items() if k != "social_data"}
+            self.conversation_history.append(replace(message, context=context))
+            return await self._share_social_context(message)
         self.conversation_history.append(message)
+        message_type = message.type or self.intents.classify(message.content)["type"]
         
-        if message.type == "question":
+        if message_type == "question":
             return await self._handle_question(message)
-        elif message.type == "complaint":
+        elif message_type == "complaint":
             return await self._handle_complaint(message)
-        elif message.type == "suggestion":
+        elif message_type == "suggestion":
             return await self._handle_suggestion(message)
-        elif message.type == "action":
+        elif message_type == "action":
             return await self._handle_action(message)
         
         return Response(
@@ -94,4 +201,370 @@ class SupervisingAgent:
         """Handle player suggestions for scenarios or system improvements"""
         suggestion_type = self._classify_suggestion(message.content)
         
-        if suggestion_type == "new_scenario":
\ No newline at end of file
+        if suggestion_type == "new_scenario":
+            return await self._propose_new_scenario(message.context)
+        elif suggestion_type == "system_improvement":
+            return Response(
+                content="Thanks! I've noted your suggestion for the game designers.",
+                explanation=None,
+                follow_up_options=["Continue current scenario", "Request new scenario"],
+                attached_data={"suggestion": message.content}
+            )
+
+        return Response(
+            content="Thanks for the idea. Could you tell me a bit more about it?",
+            explanation=None,
+            follow_up_options=["Suggest a new scenario", "Suggest a game improvement"],
+            attached_data=None
+        )
+
+    async def _handle_action(self, message: Message) -> Response:
+        """Score a player's action against the current scenario"""
+        if self.current_scenario is None:
+            return Response(
+                content="There's no active scenario yet. Want to start one?",
+                explanation=None,
+                follow_up_options=["Request new scenario"],
+                attached_data=None
+            )
+
+        metrics = message.context.get("ethical_metrics")
+        if not metrics:
+            return Response(
+                content="I can't score this yet: I don't have the ethical measurements for that action.",
+                explanation=None,
+                follow_up_options=["Describe what you did", "What are my options?"],
+                attached_data=None
+            )
+
+        action = scoring_system.PlayerAction(
+            description=message.content,
+            stakeholder_impacts=message.context.get("stakeholder_impacts", {}),
+            ethical_metrics=metrics,
+            timestamp=message.timestamp
+        )
+        score_card = self.scoring_system.calculate_score(action, {
+            "player_id": message.chat_id,
+            "difficulty": self.current_scenario.difficulty,
+            "ethical_dimensions": self.current_scenario.ethical_dimensions
+        })
+        self.last_score_card = score_card
+
+        return Response(
+            content=f"Your action scored {score_card.total_score:.1f} points.",
+            explanation=self.scoring_system.explain_score(score_card),
+            follow_up_options=[
+                "Why did I get this score?",
+                "How can I improve?",
+                "Request new scenario"
+            ],
+            attached_data={"score_card": score_card}
+        )
+
+    async def _share_social_context(self, message: Message) -> Response:
+        """Build the player's context from an exported list of interactions"""
+        try:
+            graph = self.scenario_generator.analyze_social_data(message.context["social_data"])
+        except ValueError as error:
+            return Response(
+                content=f"I couldn't read that social data: {error}",
+                explanation=None,
+                follow_up_options=["Share social context"],
+                attached_data=None
+            )
+        if not len(graph):
+            return Response(
+                content="That social data didn't mention anyone yet. Could you share some interactions?",
+                explanation=None,
+                follow_up_options=["Share social context"],
+                attached_data=None
+            )
+        self.set_player_context(scenario_system.Context(
+            location=message.context.get("location", "your community"),
+            time_frame=message.context.get("time_frame", "week"),
+            social_circle=[graph.stakeholder(name) for name in graph.neighbors()],
+            recent_events=list(message.context.get("recent_events", [])),
+            constraints=list(message.context.get("constraints", [])),
+            social_graph=graph
+        ))
+        return Response(
+            content=f"Thanks! I now know about {len(graph)} people in your circle.",
+            explanation=None,
+            follow_up_options=["Request new scenario"],
+            attached_data=None
+        )
+
+    async def _propose_new_scenario(self, context: Dict) -> Response:
+        """Start a fresh scenario at the requested or current difficulty"""
+        if self.player_context is None:
+            return Response(
+                content="Tell me a little about your social circle first so I can build a scenario.",
+                explanation=None,
+                follow_up_options=["Share social context"],
+                attached_data=None
+            )
+        current = self.current_scenario.difficulty if self.current_scenario else 1
+        difficulty = context.get("difficulty", current)
+        if self.scenarios is not None and self.scenario_profile is not None:
+            scenario = self.scenarios.get(difficulty, self.scenario_profile)
+        else:
+            scenario = self.scenario_generator.generate_scenario(self.player_context, difficulty)
+        self.current_scenario = scenario
+        return Response(
+            content=f"{scenario.title}\n\n{scenario.description}",
+            explanation=None,
+            follow_up_options=list(scenario.immediate_options),
+            attached_data={"scenario": scenario}
+        )
+
+    async def _address_scoring_complaint(self, context: Dict) -> Response:
+        """Walk the player through how their last score was computed"""
+        return Response(
+            content="Let's look at how that score was calculated.",
+            explanation=self._generate_detailed_explanation(context),
+            follow_up_options=["Appeal score", "How can I improve?"],
+            attached_data=self._get_relevant_data(context)
+        )
+
+    async def _address_scenario_complaint(self, context: Dict) -> Response:
+        """Acknowledge an unrealistic scenario and offer a replacement"""
+        return Response(
+            content="Sorry that scenario didn't feel realistic. I can generate a different one.",
+            explanation=None,
+            follow_up_options=["Request different scenario", "Lower the difficulty"],
+            attached_data=self._get_relevant_data(context)
+        )
+
+    async def _explain_score(self, context: Dict) -> Response:
+        """Explain the player's most recent score"""
+        if self.last_score_card is None:
+            return Response(
+                content="You don't have a score yet. Take an action in the current scenario first.",
+                explanation=None,
+                follow_up_options=["What are my options in this scenario?"],
+                attached_data=None
+            )
+        score_card = self.last_score_card
+        return self.responses.get_or_build(
+            self._fingerprint("score_card", score_card),
+            "score_explanation",
+            lambda: Response(
+                content=f"You scored {score_card.total_score:.1f} points.",
+                explanation=self.scoring_system.explain_score(score_card),
+                follow_up_options=["How can I improve?", "Appeal score", "Request new scenario"],
+                attached_data={"score_card": score_card}
+            )
+        )
+
+    async def _clarify_scenario(self, context: Dict) -> Response:
+        """Restate the current scenario, who is involved and what the player can do"""
+        if self.current_scenario is None:
+            return Response(
+                content="There's no active scenario yet. Want to start one?",
+                explanation=None,
+                follow_up_options=["Request new scenario"],
+                attached_data=None
+            )
+        scenario = self.current_scenario
+
+        def build() -> Response:
+            people = "\n".join(f"- {s.name} ({s.relationship})" for s in scenario.stakeholders)
+            consequences = "\n".join(f"- {line}" for line in scenario.long_term_implications)
+            return Response(
+                content=f"{scenario.title}\n\n{scenario.description}\n\nPeople involved:\n{people}",
+                explanation=f"Things to keep in mind:\n{consequences}",
+                follow_up_options=list(scenario.immediate_options),
+                attached_data={"scenario": scenario}
+            )
+        return self.responses.get_or_build(self._fingerprint("scenario", scenario), "scenario_clarification", build)
+
+    async def _provide_improvement_advice(self, context: Dict) -> Response:
+        """Suggest how to do better in the dimensions that scored lowest"""
+        if self.last_score_card is None:
+            return Response(
+                content="Once you've taken an action I can suggest where to improve.",
+                explanation=None,
+                follow_up_options=["What are my options in this scenario?"],
+                attached_data=None
+            )
+        score_card = self.last_score_card
+
+        def build() -> Response:
+            areas = score_card.improvement_areas
+            if not areas:
+                content = "You did well across every dimension. Try a harder scenario next."
+            else:
+                content = "\n".join(f"- {area}" for area in areas)
+            return Response(
+                content=content,
+                explanation=None,
+                follow_up_options=["Why did I get this score?", "Request new scenario"],
+                attached_data={"improvement_areas": list(areas)}
+            )
+        return self.responses.get_or_build(self._fingerprint("score_card", score_card), "improvement_advice", build)
+
+    def _classify_question(self, content: str) -> Optional[str]:
+        return self.intents.classify(content)["question"]
+
+    def _classify_complaint(self, content: str) -> Optional[str]:
+        return self.intents.classify(content)["complaint"]
+
+    def _classify_suggestion(self, content: str) -> Optional[str]:
+        return self.intents.classify(content)["suggestion"]
+
+    def _generate_detailed_explanation(self, context: Dict) -> Optional[str]:
+        if self.last_score_card is None:
+            return None
+        return self.scoring_system.explain_score(self.last_score_card)
+
+    def _get_relevant_data(self, context: Dict) -> Optional[Dict]:
+        data = {}
+        if self.current_scenario is not None:
+            data["scenario"] = self.current_scenario
+        if self.last_score_card is not None:
+            data["score_card"] = self.last_score_card
+        return data or None
+
+@dataclass
+class ChatSession:
+    """Per-chat state: its own agent, and the queue that keeps messages ordered"""
+    chat_id: str
+    agent: SupervisingAgent
+    queue: asyncio.Queue
+    last_active: float = field(default_factory=time.monotonic)
+    scheduled: bool = False  # waiting in, or being drained from, the ready queue
+
+ResponseHandler = Callable[[Message, Response], Awaitable[None]]
+
+# Reply for a message that arrives while its chat's queue is full
+SLOW_DOWN = Response(
+    content="You're sending messages faster than I can answer. Please slow down a little.",
+    explanation=None,
+    follow_up_options=[],
+    attached_data=None
+)
+
+class ChatDispatcher:
+    """Routes messages to per-chat queues served by a bounded worker pool.
+
+    A chat is handed to at most one worker at a time, so its messages are
+    processed in arrival order. Different chats run concurrently. Each worker
+    drains up to `batch` messages from a chat before yielding it back, which
+    keeps one busy chat from starving the rest. A chat whose queue is full gets
+    a "slow down" reply instead of holding up intake for every other chat.
+    """
+    def __init__(
+        self,
+        agent_factory: Callable[[str], SupervisingAgent],
+        workers: int = 64,
+        max_queue: int = 100,
+        batch: int = 8,
+        on_response: Optional[ResponseHandler] = None
+    ):
+        self.agent_factory = agent_factory
+        self.workers = workers
+        self.max_queue = max_queue
+        self.batch = batch
+        self.on_response = on_response
+        self.sessions: Dict[str, ChatSession] = {}
+        self.rejected = 0
+        self._ready: asyncio.Queue = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+        self._deliveries: Set[asyncio.Task] = set()
+
+    def session(self, chat_id: str) -> ChatSession:
+        session = self.sessions.get(chat_id)
+        if session is None:
+            session = self.sessions[chat_id] = ChatSession(
+                chat_id,
+                self.agent_factory(chat_id),
+                asyncio.Queue(self.max_queue)
+            )
+        return session
+
+    async def submit(self, message: Message) -> "asyncio.Future[Response]":
+        """Queue a message without waiting; a full chat queue is answered with SLOW_DOWN"""
+        session = self.session(message.chat_id)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        try:
+            session.queue.put_nowait((message, future))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            future.set_result(SLOW_DOWN)
+            if self.on_response is not None:
+                delivery = loop.create_task(self._deliver(session, message, SLOW_DOWN))
+                self._deliveries.add(delivery)
+                delivery.add_done_callback(self._deliveries.discard)
+            return future
+        session.last_active = time.monotonic()
+        if not session.scheduled:
+            session.scheduled = True
+            self._ready.put_nowait(session)
+        return future
+
+    async def _worker(self):
+        while True:
+            session = await self._ready.get()
+            try:
+                for _ in range(self.batch):
+                    if session.queue.empty():
+                        break
+                    message, future = session.queue.get_nowait()
+                    await self._process(session, message, future)
+            finally:
+                self._ready.task_done()
+                if session.queue.empty():
+                    session.scheduled = False
+                else:
+                    self._ready.put_nowait(session)
+
+    async def _process(self, session: ChatSession, message: Message, future: asyncio.Future):
+        try:
+            response = await session.agent.handle_message(message)
+        except Exception as error:
+            logger.exception("handler failed for chat %s", session.chat_id)
+            if not future.done():
+                future.set_exception(error)
+            return
+        if not future.done():
+            future.set_result(response)
+        if self.on_response is not None:
+            await self._deliver(session, message, response)
+
+    async def _deliver(self, session: ChatSession, message: Message, response: Response):
+        try:
+            await self.on_response(message, response)
+        except Exception:
+            # A failed delivery must not take the worker down with it
+            logger.exception("response callback failed for chat %s", session.chat_id)
+
+    def start(self):
+        """Spawn the worker pool on the running loop"""
+        if not self._tasks:
+            loop = asyncio.get_running_loop()
+            self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def join(self):
+        """Wait until every queued message has been processed"""
+        while any(not s.queue.empty() or s.scheduled for s in self.sessions.values()):
+            await self._ready.join()
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, *self._deliveries, return_exceptions=True)
+        self._tasks = []
+
+    def evict_idle(self, max_idle: float) -> int:
+        """Drop sessions with nothing queued that have been idle for `max_idle` seconds"""
+        cutoff = time.monotonic() - max_idle
+        idle = [
+            chat_id for chat_id, s in self.sessions.items()
+            if s.last_active < cutoff and not s.scheduled and s.queue.empty()
+        ]
+        for chat_id in idle:
+            history = self.sessions.pop(chat_id).agent.conversation_history
+            if isinstance(history, chat_history.ChatHistory):
+                history.store.forget(chat_id)
+        return len(idle)